@@ -1,19 +1,34 @@
 import os
+import re
 import json
-from selenium.webdriver.remote.webdriver import WebDriver
 import time
+from dataclasses import dataclass, field
+from matcher import StopWords
+from pacing import PROFILES, DEFAULT_PROFILE
 
-ACCOUNTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "accounts")
+ACCOUNTS_DIR = os.environ.get("HH_ACCOUNTS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "accounts"))
+# HH_URL и HH_ACCOUNTS_DIR позволяют направить бота на локальный стенд (bench/stand.py)
+HH_URL = os.environ.get("HH_URL", "https://hh.ru")
 os.makedirs(ACCOUNTS_DIR, exist_ok=True)
 
+# список аккаунтов и их настройки кешируются по mtime: папка accounts меняет mtime,
+# когда в ней создают или удаляют аккаунт, settings.json — когда его сохраняют
+_account_dirs = (None, [])
+_settings = {}
+
+
 def list_account_dirs():
+    global _account_dirs
     def extract_timestamp(name):
         parts = name.rsplit("_", 1)
         if len(parts) == 2 and parts[1].isdigit():
             return int(parts[1])
         return 0
-    dirs = [d for d in os.listdir(ACCOUNTS_DIR) if os.path.isdir(os.path.join(ACCOUNTS_DIR, d))]
-    return sorted(dirs, key=extract_timestamp)
+    mtime = os.stat(ACCOUNTS_DIR).st_mtime_ns
+    if _account_dirs[0] != mtime:
+        dirs = [d for d in os.listdir(ACCOUNTS_DIR) if os.path.isdir(os.path.join(ACCOUNTS_DIR, d))]
+        _account_dirs = (mtime, sorted(dirs, key=extract_timestamp))
+    return list(_account_dirs[1])
 
 def get_account_dir(name: str) -> str:
     return os.path.join(ACCOUNTS_DIR, name)
@@ -21,35 +36,92 @@ def get_account_dir(name: str) -> str:
 def get_cookie_file_path(name: str) -> str:
     return os.path.join(get_account_dir(name), "cookies.json")
 
-def get_account_settings(name: str):
+def get_vacancy_index_path(name: str) -> str:
+    return os.path.join(get_account_dir(name), "vacancies.sqlite3")
+
+def get_runs_dir(name: str) -> str:
+    return os.path.join(get_account_dir(name), "runs")
+
+@dataclass(frozen=True)
+class AccountSettings:
+    urls: list[str] = field(default_factory=list)
+    vacancy_text: str = ""
+    excluded_words: list[str] = field(default_factory=list)
+    pacing: str | dict = "normal"
+    resume_hash: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict, path: str = "settings.json"):
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: ожидается JSON объект с настройками")
+
+        def check(key, valid, expected):
+            if key in data and not valid(data[key]):
+                raise ValueError(f"{path}: поле \"{key}\" должно быть {expected}, получено: {data[key]!r}")
+
+        is_strings = lambda value: isinstance(value, list) and all(isinstance(item, str) for item in value)
+        check("urls", is_strings, "списком ссылок")
+        check("excluded_words", is_strings, "списком строк")
+        check("vacancy_text", lambda value: isinstance(value, str), "строкой")
+        check("pacing", lambda value: isinstance(value, (str, dict)), "названием профиля или словарём")
+        check("resume_hash", lambda value: value is None or isinstance(value, str), "строкой")
+
+        # ошибки профиля пауз и регулярных выражений всплыли бы позже, без имени файла
+        pacing = data.get("pacing", DEFAULT_PROFILE)
+        profile = pacing.get("profile", DEFAULT_PROFILE) if isinstance(pacing, dict) else pacing
+        if profile not in PROFILES:
+            raise ValueError(f"{path}: неизвестный профиль пауз {profile!r}, доступны: {', '.join(PROFILES)}")
+        # стоп-слова собираются так же, как при запуске, — иначе проверка пропустит то, на чём упадёт парсер
+        for rule in data.get("excluded_words", []):
+            try:
+                StopWords([rule])
+            except re.error as e:
+                raise ValueError(f"{path}: неверное регулярное выражение в \"excluded_words\": {rule!r} ({e})")
+        return cls(
+            urls=data.get("urls", []),
+            vacancy_text=data.get("vacancy_text", ""),
+            excluded_words=data.get("excluded_words", []),
+            pacing=pacing,
+            resume_hash=data.get("resume_hash"),
+        )
+
+
+def load_account_settings(name: str) -> AccountSettings:
     settings_path = get_settings_file_path(name)
-    if not os.path.exists(settings_path):
+    try:
+        mtime = os.stat(settings_path).st_mtime_ns
+    except FileNotFoundError:
         raise FileNotFoundError(f"Settings file not found: {settings_path}")
+    cached = _settings.get(settings_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
     with open(settings_path, "r", encoding="utf-8") as f:
-        settings = json.load(f)
-    return {
-        "urls": settings.get("urls", []),
-        "vacancy_text": settings.get("vacancy_text", ""),
-        "excluded_words": settings.get("excluded_words", [])
-    }
+        settings = AccountSettings.from_dict(json.load(f), settings_path)
+    _settings[settings_path] = (mtime, settings)
+    return settings
+
+
 def get_settings_file_path(name: str) -> str:
     return os.path.join(get_account_dir(name), "settings.json")
 
-def save_cookies(driver: WebDriver, path: str):
+def save_cookies(driver, path: str):
     with open(path, "w", encoding="utf-8") as f:
         json.dump(driver.get_cookies(), f, ensure_ascii=False, indent=2)
 
-def load_cookies(driver: WebDriver, path: str):
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Cookie file not found: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        cookies = json.load(f)
-    driver.get("https://hh.ru")
+def load_cookies(driver, path: str):
+    cookies = read_cookies(path)
+    driver.get(HH_URL)
     for cookie in cookies:
         cookie.pop("sameSite", None)
         driver.add_cookie(cookie)
 
-def add_new_account_cookies(driver: WebDriver) -> str:
+def read_cookies(path: str) -> list[dict]:
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Cookie file not found: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def add_new_account_cookies(driver) -> str:
     base_name = input("📝 Введите имя нового аккаунта (например, texet, work, alt1): ").strip()
     dirs = list_account_dirs()
     existing = [d for d in dirs if d.rsplit("_", 1)[0] == base_name]
@@ -66,7 +138,7 @@ def add_new_account_cookies(driver: WebDriver) -> str:
     settings_path = get_settings_file_path(name)
 
     print(f"🔐 Открывается сайт для аккаунта '{name}'.")
-    driver.get("https://hh.ru")
+    driver.get(HH_URL)
     input("➡️  После входа в аккаунт нажмите Enter для сохранения cookies...")
 
     driver.refresh()
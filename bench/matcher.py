@@ -0,0 +1,67 @@
+import argparse
+import random
+import time
+from matcher import StopWords
+
+# Микробенчмарк фильтра стоп-слов: старый цикл из is_valid_vacancy против
+# скомпилированного выражения (по карточке и одним сканированием страницы).
+#   python -m bench.matcher --words 300 --cards 5000
+
+SYLLABLES = ["ра", "бо", "та", "ко", "де", "ли", "ма", "ну", "ст", "ер", "ги", "зо", "пе", "ша", "ja", "va", "py", "on", "dev", "ops", "lead", "qa"]
+
+
+def random_word(rng: random.Random, low: int = 2, high: int = 4) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(low, high)))
+
+
+def loop_is_valid(excluded_words, title, employer):
+    for word in excluded_words:
+        if word.lower() in title.lower() or word.lower() in employer.lower():
+            return False
+    return True
+
+
+def measure(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк фильтра стоп-слов")
+    parser.add_argument("--words", type=int, default=300)
+    parser.add_argument("--cards", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = [random_word(rng, 3, 5) for _ in range(args.words)]
+    cards = [(" ".join(random_word(rng).capitalize() for _ in range(3)), f"ООО {random_word(rng).capitalize()}") for _ in range(args.cards)]
+    pages = [cards[i:i + args.page_size] for i in range(0, len(cards), args.page_size)]
+
+    started = time.perf_counter()
+    stop_words = StopWords(words)
+    compile_time = time.perf_counter() - started
+
+    expected = {i for i, (title, employer) in enumerate(cards) if not loop_is_valid(words, title, employer)}
+    per_card = {i for i, (title, employer) in enumerate(cards) if stop_words.matches(title, employer)}
+    batched = set()
+    for page_number, page in enumerate(pages):
+        batched |= {page_number * args.page_size + i for i in stop_words.excluded_indexes(page)}
+    assert expected == per_card == batched, "результаты фильтров расходятся"
+
+    results = {
+        "цикл (как в is_valid_vacancy)": measure(lambda: [loop_is_valid(words, t, e) for t, e in cards], args.repeat),
+        "скомпилированное выражение": measure(lambda: [stop_words.matches(t, e) for t, e in cards], args.repeat),
+        "пакетно по странице": measure(lambda: [stop_words.excluded_indexes(page) for page in pages], args.repeat),
+    }
+
+    print(f"🧪 {args.words} стоп-слов × {args.cards} карточек, исключено {len(expected)}; компиляция {compile_time * 1000:.2f} мс")
+    baseline = results["цикл (как в is_valid_vacancy)"]
+    for name, seconds in results.items():
+        print(f"⏱️ {name}: {seconds * 1000:.1f} мс ({args.cards / seconds:,.0f} карточек/с, x{baseline / seconds:.1f})")
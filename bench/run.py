@@ -0,0 +1,181 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from bench.stand import Stand, serve, base_url, make_account
+
+# Сквозной бенчмарк против локального стенда: поднимает bench/stand.py, создаёт
+# временный аккаунт и прогоняет парсер и откликер по фазам. Результат можно
+# сохранить в JSON и сравнить с прогоном на другом коммите:
+#   python -m bench.run --scrape-mode=http --out before.json
+#   python -m bench.run --scrape-mode=http --compare before.json
+# С --incremental после первого прохода стенд публикует --publish новых вакансий,
+# и фаза rescrape показывает, сколько страниц нужно повторному запуску.
+# Для --scrape-mode=browser и --respond --respond-mode=browser нужен установленный Chrome.
+
+NO_PACING = {"profile": "aggressive", "page": (0, 0), "url": (0, 0), "vacancy": (0, 0)}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Phases:
+    def __init__(self, session, verbose: bool):
+        self.session = session
+        self.verbose = verbose
+        self.seconds = {}
+        self.round_trips = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        trips = self.session.driver.round_trips if self.session.started else 0
+        output = contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+        started = time.perf_counter()
+        try:
+            with output:
+                yield
+        finally:
+            self.seconds[name] = round(time.perf_counter() - started, 3)
+            if self.session.started:
+                self.round_trips[name] = self.session.driver.round_trips - trips
+
+
+def run(args) -> dict:
+    stand = Stand(pages=args.pages, latency=args.latency)
+    server = serve(stand)
+    url = base_url(server)
+    accounts_dir = tempfile.mkdtemp(prefix="hh-bench-")
+    os.environ["HH_URL"] = url
+    os.environ["HH_ACCOUNTS_DIR"] = accounts_dir
+    make_account(accounts_dir, url, vacancy_text="Здравствуйте! Меня заинтересовала ваша вакансия.")
+
+    # accounts читает HH_URL и HH_ACCOUNTS_DIR при импорте
+    from bot import HHScraper, HHResponder
+    from runner import chrome_options_from_args
+    from driver import BrowserSession
+    from pacing import Pacer
+
+    chrome_options = chrome_options_from_args(args)
+    session = BrowserSession(chrome_options, block_resources=args.block_resources, page_load_strategy=args.page_load_strategy, interactive=False)
+    pacer = Pacer(NO_PACING if args.pacing == "none" else args.pacing)
+    scraper = HHScraper(chrome_options, max_pages=args.max_pages, account_id="1", scrape_mode=args.scrape_mode, session=session, pacer=pacer, preclassify=args.preclassify, incremental=args.incremental)
+    phases = Phases(session, args.verbose)
+    result = {}
+    try:
+        if args.scrape_mode == "browser" or (args.respond and args.respond_mode == "browser"):
+            with phases.phase("launch"):
+                session.driver
+        with phases.phase("login"):
+            scraper.ensure_login()
+        with phases.phase("scrape"):
+            vacancies = list(scraper.iter_vacancies())
+        pages = stand.requests.get("serp", 0)
+        if args.incremental:
+            scraper.index.flush()
+            stand.publish(args.publish)
+            rescraper = HHScraper(chrome_options, max_pages=args.max_pages, account_id="1", scrape_mode=args.scrape_mode, session=session, pacer=pacer, incremental=True)
+            try:
+                with phases.phase("rescrape"):
+                    result["rescrape_vacancies"] = len(list(rescraper.iter_vacancies()))
+            finally:
+                rescraper.close()
+            result["rescrape_pages"] = stand.requests.get("serp", 0) - pages
+        applied = redirected = 0
+        if args.respond:
+            targets = vacancies[:args.responses] if args.responses else vacancies
+            responder = HHResponder(chrome_options, targets, scraper.cookie_path, scraper.account_name, session=session, index=scraper.index, pacer=pacer, respond_mode=args.respond_mode, classifier=scraper.classifier)
+            with phases.phase("respond"):
+                responder.respond_to_all()
+            applied, redirected = len(responder.applied_responses), len(responder.redirected_responses)
+            result["responses_attempted"] = len(targets)
+        result["chrome_rss_mb"] = session.driver.rss_mb if session.started else None
+    finally:
+        session.quit()
+        scraper.close()
+        server.shutdown()
+        shutil.rmtree(accounts_dir, ignore_errors=True)
+
+    result.update({
+        "commit": git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("out", "compare", "verbose")},
+        "phases": phases.seconds,
+        "round_trips": phases.round_trips,
+        "pages": pages,
+        "pages_per_sec": round(pages / phases.seconds["scrape"], 2) if phases.seconds.get("scrape") else None,
+        "vacancies": len(vacancies),
+        "vacancies_per_min": round(len(vacancies) / phases.seconds["scrape"] * 60, 1) if phases.seconds.get("scrape") else None,
+        "applied": applied,
+        "redirected": redirected,
+        "responses_per_min": round(applied / phases.seconds["respond"] * 60, 1) if phases.seconds.get("respond") else None,
+        "stand_requests": stand.requests,
+    })
+    return result
+
+
+METRICS = ["pages_per_sec", "vacancies_per_min", "responses_per_min", "chrome_rss_mb"]
+
+
+def print_result(result: dict, previous: dict = None):
+    print(f"\n🧪 Бенчмарк {result['commit'] or ''}: {json.dumps(result['config'], ensure_ascii=False)}")
+    for name, seconds in result["phases"].items():
+        line = f"⏱️ {name}: {seconds:.3f} с"
+        if name in result["round_trips"]:
+            line += f", запросов к WebDriver: {result['round_trips'][name]}"
+        if previous and name in previous.get("phases", {}):
+            line += f" (было {previous['phases'][name]:.3f} с)"
+        print(line)
+    print(f"📄 Страниц: {result['pages']}, вакансий: {result['vacancies']}, откликов: {result['applied']}, редиректов: {result['redirected']}")
+    if "rescrape_pages" in result:
+        print(f"🔁 Повторный проход: страниц {result['rescrape_pages']}, вакансий {result['rescrape_vacancies']}")
+    for metric in METRICS:
+        value = result.get(metric)
+        if value is None:
+            continue
+        line = f"📈 {metric}: {value}"
+        old = (previous or {}).get(metric)
+        if old:
+            line += f" (было {old}, {(value - old) / old * 100:+.1f}%)"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сквозной бенчмарк бота на локальном стенде hh.ru")
+    parser.add_argument("--scrape-mode", choices=["browser", "http"], default="http")
+    parser.add_argument("--respond", action="store_true", help="Прогнать и фазу откликов (для --respond-mode=browser нужен Chrome)")
+    parser.add_argument("--respond-mode", choices=["browser", "http"], default="browser")
+    parser.add_argument("--responses", type=int, default=20, help="Сколько вакансий отправить в откликер (0 — все)")
+    parser.add_argument("--pages", type=int, default=10, help="Сколько страниц выдачи отдаёт стенд")
+    parser.add_argument("--max-pages", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="Искусственная задержка стенда на запрос, секунды")
+    parser.add_argument("--headed", action="store_true", help="Показывать окно браузера")
+    parser.add_argument("--block-resources", action="store_true")
+    parser.add_argument("--preclassify", action="store_true", help="Проверять вакансии по HTTP до откликера")
+    parser.add_argument("--incremental", action="store_true", help="Инкрементальный парсинг и повторный проход после публикации новых вакансий")
+    parser.add_argument("--publish", type=int, default=5, help="Сколько новых вакансий опубликовать перед повторным проходом --incremental")
+    parser.add_argument("--page-load-strategy", choices=["normal", "eager", "none"])
+    parser.add_argument("--pacing", default="none", help="Профиль пауз; none — без пауз, чтобы мерить сам бот")
+    parser.add_argument("--out", help="Сохранить результат в JSON")
+    parser.add_argument("--compare", help="Сравнить с ранее сохранённым JSON")
+    parser.add_argument("--verbose", action="store_true", help="Показывать вывод бота")
+    args = parser.parse_args()
+    args.headless = not args.headed
+
+    previous = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    result = run(args)
+    print_result(result, previous)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"💾 Результат сохранён в {args.out}")
@@ -0,0 +1,352 @@
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Локальный стенд, имитирующий hh.ru: отдаёт выдачу, страницы вакансий, попап
+# отклика с полем письма, предупреждение о релокации, внешние редиректы, анкеты
+# и ошибку лимита откликов — с теми же data-qa атрибутами, на которые опирается бот.
+#   python -m bench.stand --port 8765 --accounts-dir /tmp/hh-stand
+#   HH_URL=http://127.0.0.1:8765 HH_ACCOUNTS_DIR=/tmp/hh-stand python main.py --account=1 --scrape-mode=http
+
+SESSION_COOKIE = "hhtoken"
+XSRF_COOKIE = "_xsrf"
+VIEWED_CARD_CLASS = "workflow-status-container--cGFP1E5X940FGAbg"
+RESPONSE_PATH = "/applicant/vacancy_response/popup"
+
+# тип вакансии определяется её номером: так выдача детерминирована между запусками
+KINDS = ["popup", "popup", "popup", "popup", "relocation", "simple", "external", "questionnaire", "popup", "popup"]
+
+CITIES = ["Москва, Арбатская", "Санкт-Петербург", "Казань", "Новосибирск, Речной вокзал"]
+
+# картинка, шрифт и «сторонний» счётчик, чтобы было что блокировать (--block-resources)
+ASSETS = {
+    "/static/logo.png": ("image/png", 40_000),
+    "/static/font.woff2": ("font/woff2", 60_000),
+    "/mc.yandex.ru/watch.js": ("application/javascript", 80_000),
+}
+ASSET_TAGS = """
+<link rel="preload" href="/static/font.woff2" as="font" crossorigin>
+<img src="/static/logo.png" alt="">
+<script src="/mc.yandex.ru/watch.js" async></script>
+"""
+
+
+class Stand:
+    def __init__(self, pages: int = 5, per_page: int = 20, viewed_every: int = 9, latency: float = 0.0, response_limit: int = 200):
+        self.pages = pages
+        self.per_page = per_page
+        self.viewed_every = viewed_every
+        self.latency = latency
+        self.response_limit = response_limit
+        self.published = 0
+        self.requests = {}
+        self.responses = []
+        self.lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        return self.pages * self.per_page + self.published
+
+    def publish(self, count: int):
+        # новые вакансии получают следующие номера и попадают в начало выдачи по дате
+        self.published += count
+
+    def vacancy(self, index: int) -> dict:
+        return {
+            "id": str(100000 + index),
+            "title": f"Python разработчик {index}",
+            "employer": f"ООО Компания {index % 7}",
+            "city": CITIES[index % len(CITIES)],
+            "kind": KINDS[index % len(KINDS)],
+            "viewed": self.viewed_every > 0 and index % self.viewed_every == self.viewed_every - 1,
+        }
+
+    def vacancy_by_id(self, vacancy_id: str):
+        index = int(vacancy_id) - 100000
+        if 0 <= index < self.total:
+            return self.vacancy(index)
+        return None
+
+    def page_vacancies(self, page: int, by_date: bool = False) -> list[dict]:
+        start = page * self.per_page
+        if page < 0 or start >= self.total:
+            return []
+        indexes = range(start, min(start + self.per_page, self.total))
+        if by_date:
+            indexes = [self.total - 1 - i for i in indexes]
+        return [self.vacancy(i) for i in indexes]
+
+    def count(self, kind: str):
+        with self.lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+
+    def respond(self, vacancy_id: str, letter: str) -> bool:
+        with self.lock:
+            if len(self.responses) >= self.response_limit:
+                return False
+            self.responses.append({"id": vacancy_id, "letter": letter})
+            return True
+
+    def responded(self, vacancy_id: str) -> bool:
+        with self.lock:
+            return any(response["id"] == vacancy_id for response in self.responses)
+
+    def limit_reached(self) -> bool:
+        with self.lock:
+            return len(self.responses) >= self.response_limit
+
+
+def render_card(vacancy: dict, query: str) -> str:
+    viewed = f'<div class="{VIEWED_CARD_CLASS}">Вы смотрели</div>' if vacancy["viewed"] else ""
+    return f"""
+<div data-qa="vacancy-serp__vacancy" class="vacancy-card">
+  <h2><a data-qa="serp-item__title" href="/vacancy/{vacancy['id']}?query={escape(query)}&amp;hhtmFrom=vacancy_search_list">
+    <span data-qa="serp-item__title-text">{escape(vacancy['title'])}</span>
+  </a></h2>
+  <div class="info"><span data-qa="vacancy-serp__vacancy-employer-text">{escape(vacancy['employer'])}</span>
+    <span data-qa="vacancy-serp__vacancy-address">{escape(vacancy['city'])}</span></div>
+  {viewed}
+</div>"""
+
+
+def render_page(title: str, body: str, logged_in: bool) -> str:
+    infotip = '<div data-qa="multiaccount-infotip">Аккаунт</div>' if logged_in else ""
+    return f"""<!DOCTYPE html>
+<html lang="ru"><head><meta charset="utf-8"><title>{escape(title)}</title></head>
+<body>{infotip}{ASSET_TAGS}{body}</body></html>"""
+
+
+# сценарий страницы вакансии повторяет поведение hh.ru: кнопка «Откликнуться»
+# либо уводит на другую страницу, либо открывает попап (иногда после
+# предупреждения о релокации), либо сразу показывает ошибку лимита
+VACANCY_SCRIPT = """
+<script>
+const vacancy = JSON.parse(document.getElementById("vacancy-data").textContent);
+const root = document.getElementById("response-root");
+
+function submitResponse(letter) {
+    const body = new URLSearchParams({vacancy_id: vacancy.id, letter: letter});
+    const xsrf = (document.cookie.match(/(?:^|; )_xsrf=([^;]*)/) || [])[1] || "";
+    return fetch("%(response_path)s", {method: "POST", body: body, credentials: "same-origin", headers: {"X-Xsrftoken": xsrf}});
+}
+
+function showLimitError() {
+    root.innerHTML = '<div data-qa="vacancy-response-error-notification">В течение 24 часов можно совершить не более 200 откликов</div>';
+}
+
+function showPopup() {
+    root.innerHTML = `
+        <div data-qa="vacancy-response-popup">
+            <div data-qa="textarea-native-wrapper"><textarea name="letter"></textarea></div>
+            <button type="submit" data-qa="vacancy-response-submit-popup">Откликнуться</button>
+        </div>`;
+    root.querySelector("button").addEventListener("click", () => {
+        submitResponse(root.querySelector("textarea").value).then((response) => {
+            if (response.ok) {
+                root.innerHTML = '<div data-qa="vacancy-response-success">Отклик отправлен</div>';
+            } else {
+                showLimitError();
+            }
+        });
+    });
+}
+
+function showRelocation() {
+    root.innerHTML = `
+        <div data-qa="magritte-alert">Вакансия в другой стране
+            <button data-qa="relocation-warning-confirm">Всё равно откликнуться</button>
+        </div>`;
+    root.querySelector("button").addEventListener("click", () => setTimeout(showPopup, 100));
+}
+
+document.querySelector('[data-qa="vacancy-response-link-top"]')?.addEventListener("click", (event) => {
+    event.preventDefault();
+    if (vacancy.limit) return setTimeout(showLimitError, 100);
+    if (vacancy.kind === "external") return location.assign("/external/" + vacancy.id);
+    if (vacancy.kind === "questionnaire") return location.assign("/applicant/vacancy_response?vacancyId=" + vacancy.id);
+    if (vacancy.kind === "relocation") return setTimeout(showRelocation, 100);
+    if (vacancy.kind === "simple") {
+        return submitResponse("").then((response) => {
+            root.innerHTML = response.ok
+                ? '<div data-qa="vacancy-response-success">Отклик отправлен</div>'
+                : '<div data-qa="vacancy-response-error-notification">Лимит откликов</div>';
+        });
+    }
+    setTimeout(showPopup, 100);
+});
+</script>
+""" % {"response_path": RESPONSE_PATH}
+
+
+# признаки, по которым вакансию можно разобрать без браузера (classify.py)
+KIND_NOTICES = {
+    "questionnaire": '<div data-qa="employer-asking-for-test">Работодатель просит ответить на несколько вопросов</div>',
+    "relocation": '<div data-qa="vacancy-relocation-warning">Вакансия в другой стране</div>',
+}
+
+
+def render_vacancy(vacancy: dict, limit_reached: bool, responded: bool = False) -> str:
+    data = json.dumps({"id": vacancy["id"], "kind": vacancy["kind"], "limit": limit_reached})
+    if responded:
+        link = f'<a data-qa="vacancy-response-link-view-topic" href="/applicant/negotiations?vacancyId={vacancy["id"]}">Вы откликнулись</a>'
+    else:
+        href = f"/external/{vacancy['id']}" if vacancy["kind"] == "external" else f"/applicant/vacancy_response?vacancyId={vacancy['id']}"
+        link = f'<a data-qa="vacancy-response-link-top" href="{href}">Откликнуться</a>'
+    return f"""
+<h1 data-qa="vacancy-title">{escape(vacancy['title'])}</h1>
+<a data-qa="vacancy-company-name" href="/employer/{vacancy['id']}">{escape(vacancy['employer'])}</a>
+{KIND_NOTICES.get(vacancy["kind"], "")}
+{link}
+<div id="response-root"></div>
+<script type="application/json" id="vacancy-data">{data}</script>
+{VACANCY_SCRIPT}"""
+
+
+class StandHandler(BaseHTTPRequestHandler):
+    stand: Stand = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def cookies(self) -> dict:
+        pairs = (item.strip().split("=", 1) for item in self.headers.get("Cookie", "").split(";") if "=" in item)
+        return {name: value for name, value in pairs}
+
+    def logged_in(self) -> bool:
+        return SESSION_COOKIE in self.cookies()
+
+    def send_body(self, body: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_html(self, html: str, status: int = 200):
+        self.send_body(html.encode("utf-8"), "text/html; charset=utf-8", status)
+
+    def send_json(self, data: dict, status: int = 200):
+        self.send_body(json.dumps(data).encode("utf-8"), "application/json", status)
+
+    def handle_request(self, kind: str):
+        self.stand.count(kind)
+        if self.stand.latency:
+            time.sleep(self.stand.latency)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        vacancy_match = re.fullmatch(r"/vacancy/(\d+)", url.path)
+
+        if url.path in ASSETS:
+            self.stand.count("asset")
+            content_type, size = ASSETS[url.path]
+            self.send_body(b"\0" * size, content_type)
+        elif url.path == "/":
+            self.handle_request("home")
+            self.send_html(render_page("hh.ru stand", "<h1>Работа найдётся для каждого</h1>", self.logged_in()))
+        elif url.path == "/search/vacancy":
+            self.handle_request("serp")
+            page = int(query.get("page", ["0"])[0])
+            text = query.get("text", [""])[0]
+            by_date = query.get("order_by", [""])[0] == "publication_time"
+            cards = "".join(render_card(v, text) for v in self.stand.page_vacancies(page, by_date))
+            header = f'<h1 data-qa="vacancies-search-header">Найдено {self.stand.total:,} вакансий</h1>'.replace(",", "\u00a0")
+            self.send_html(render_page("Поиск вакансий", f"{header}<main>{cards}</main>", self.logged_in()))
+        elif vacancy_match and self.stand.vacancy_by_id(vacancy_match.group(1)):
+            self.handle_request("vacancy")
+            vacancy = self.stand.vacancy_by_id(vacancy_match.group(1))
+            self.send_html(render_page(vacancy["title"], render_vacancy(vacancy, self.stand.limit_reached(), self.stand.responded(vacancy["id"])), self.logged_in()))
+        elif url.path.startswith("/external/"):
+            self.handle_request("external")
+            self.send_html(render_page("Сайт работодателя", "<h1>Анкета на сайте компании</h1>", self.logged_in()))
+        elif url.path == "/applicant/vacancy_response":
+            self.handle_request("questionnaire")
+            self.send_html(render_page("Анкета", '<form data-qa="employer-asking-for-test">Ответьте на вопросы</form>', self.logged_in()))
+        else:
+            self.handle_request("not_found")
+            self.send_html(render_page("Не найдено", "<h1>404</h1>", self.logged_in()), status=404)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        if url.path != RESPONSE_PATH:
+            self.handle_request("not_found")
+            return self.send_json({"error": "not-found"}, status=404)
+
+        self.handle_request("response")
+        if not self.logged_in():
+            return self.send_json({"error": "unauthorized"}, status=403)
+        # как и hh.ru, стенд принимает POST только с заголовком, совпадающим с cookie _xsrf
+        xsrf = self.cookies().get(XSRF_COOKIE)
+        if xsrf and self.headers.get("X-Xsrftoken") != xsrf:
+            return self.send_json({"error": "xsrf"}, status=403)
+        vacancy_id = form.get("vacancy_id", [""])[0]
+        vacancy = self.stand.vacancy_by_id(vacancy_id)
+        if not vacancy:
+            return self.send_json({"error": "vacancy-not-found"}, status=404)
+        if vacancy["kind"] in ("external", "questionnaire"):
+            return self.send_json({"error": "test-required" if vacancy["kind"] == "questionnaire" else "external-vacancy"}, status=400)
+        if not self.stand.respond(vacancy_id, form.get("letter", [""])[0]):
+            return self.send_json({"error": "negotiations-limit-exceeded"}, status=400)
+        self.send_json({"success": "true"})
+
+
+def serve(stand: Stand, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    handler = type("BoundStandHandler", (StandHandler,), {"stand": stand})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def make_account(accounts_dir: str, url: str, name: str = "stand", vacancy_text: str = "", excluded_words=None) -> str:
+    host = urlparse(url).hostname
+    account_dir = os.path.join(accounts_dir, f"{name}_{int(time.time())}")
+    os.makedirs(account_dir, exist_ok=True)
+    with open(os.path.join(account_dir, "cookies.json"), "w", encoding="utf-8") as f:
+        json.dump([
+            {"name": SESSION_COOKIE, "value": "stand", "domain": host, "path": "/"},
+            {"name": XSRF_COOKIE, "value": "stand-xsrf", "domain": host, "path": "/"},
+        ], f, ensure_ascii=False, indent=2)
+    with open(os.path.join(account_dir, "settings.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "urls": [f"{url}/search/vacancy?text=python"],
+            "vacancy_text": vacancy_text,
+            "excluded_words": excluded_words or [],
+        }, f, ensure_ascii=False, indent=2)
+    return account_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Локальный стенд hh.ru")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages", type=int, default=5, help="Сколько страниц выдачи отдавать")
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка ответа на каждый запрос, секунды")
+    parser.add_argument("--response-limit", type=int, default=200, help="После скольких откликов показывать ошибку лимита")
+    parser.add_argument("--accounts-dir", help="Создать в этой папке тестовый аккаунт, настроенный на стенд")
+    args = parser.parse_args()
+
+    server = serve(Stand(pages=args.pages, latency=args.latency, response_limit=args.response_limit), args.host, args.port)
+    url = base_url(server)
+    print(f"🧪 Стенд запущен: {url}")
+    if args.accounts_dir:
+        print(f"👤 Тестовый аккаунт: {make_account(args.accounts_dir, url)}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,702 @@
+from lazy import LazyImport
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from accounts import add_new_account_cookies, select_account, load_account_settings, get_vacancy_index_path, ACCOUNTS_DIR
+from driver import BrowserSession, is_dead_session_error
+from serp import SERP_CARDS_JS, SERP_TOTAL_JS, VIEWED_CARD_CLASS, VACANCY_CARD_XPATH, VACANCY_TITLE_XPATH, VACANCY_LINK_XPATH, VACANCY_EMPLOYER_XPATH, VACANCY_ADDRESS_XPATH, normalize_card, parse_serp, parse_total
+from matcher import StopWords
+from metrics import metrics
+from pacing import Pacer, RateLimiter
+from waits import network_idle, CLICK_AND_MARK_JS
+from classify import Preclassifier, REDIRECT_VERDICTS, VERDICT_LABELS, RELOCATION, RESPONDED as ALREADY_RESPONDED
+from letter import LetterTemplate, FILL_TEXTAREA_JS
+from journal import Journal, Checkpoint
+from storage import VacancyIndex, SEEN, APPLIED, REDIRECTED, RESPONDED, EXCLUDED, ERRORED
+from http_client import cookies_session, fetch_html, submit_response, is_logged_in as is_logged_in_http, LIMIT_ERROR
+import os
+import math
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Selenium импортируется при первом обращении: --accounts и HTTP режимы стартуют без него
+By = LazyImport("selenium.webdriver.common.by", "By")
+WebDriverWait = LazyImport("selenium.webdriver.support.ui", "WebDriverWait")
+EC = LazyImport("selenium.webdriver.support.expected_conditions")
+selenium_exceptions = LazyImport("selenium.common.exceptions")
+requests = LazyImport("requests")
+
+TEXTAREA_WRAPPER = 'div[data-qa="textarea-native-wrapper"]'
+COUNTRY_ALERT = 'div[data-qa="magritte-alert"]'
+RESPONSE_ERROR_XPATH = "//div[@data-qa='vacancy-response-error-notification']"
+SUBMIT_BUTTON_XPATH = "//button[@type='submit' and (@data-qa='vacancy-response-letter-submit' or @data-qa='vacancy-response-submit-popup')]"
+DATE_ORDER = "publication_time"
+
+
+class HHScraper():
+    def __init__(self, options, max_pages: int = 5, account_id=None, scrape_mode: str = "browser", session: BrowserSession = None, pacer: Pacer = None, journal: Journal = None, checkpoint: Checkpoint = None, incremental: bool = False, preclassify: bool = False, concurrency: int = 1, request_rate: float = None, account_name: str = None):
+        self.all_vacancies = []
+        self.seen = set()
+        self.options = options
+        self.max_pages = max_pages
+        self.scrape_mode = scrape_mode
+        self.incremental = incremental
+
+        self.account_path = os.path.join(ACCOUNTS_DIR, f"{account_name or select_account(account_id)}")
+        self.cookie_path = os.path.join(self.account_path, "cookies.json")
+        self.account_name = os.path.basename(self.account_path)
+        self.settings = load_account_settings(self.account_name)
+        self.excluded_words = self.settings.excluded_words
+        self.stop_words = StopWords(self.excluded_words)
+        self.urls = self.settings.urls
+        self.index = VacancyIndex(get_vacancy_index_path(self.account_name))
+        self.pacer = pacer or Pacer(self.settings.pacing)
+        self.journal = journal
+        self.checkpoint = checkpoint
+
+        self.session = session or BrowserSession(options)
+        if self.session.cookie_path is None:
+            self.session.cookie_path = self.cookie_path
+        if self.scrape_mode == "http":
+            # в HTTP режиме Chrome для парсинга не нужен, он запустится только у откликера
+            self.http = cookies_session(self.cookie_path)
+        self.concurrency = concurrency
+        self.stopped = threading.Event()
+        self.rate_limiter = None
+        if concurrency > 1:
+            if self.scrape_mode == "http":
+                # по умолчанию весь аккаунт держит темп профиля пауз: параллельность прячет
+                # задержки сети, а не умножает число запросов к hh.ru
+                self.rate_limiter = RateLimiter(request_rate or self.pacer.rate("page"))
+            else:
+                print("⚠️ Параллельный обход выдачи доступен только с --scrape-mode=http: Chrome один на аккаунт и делится с откликером.")
+        self.classifier = None
+        if preclassify:
+            limiter = RateLimiter(request_rate or self.pacer.rate("page"))
+            self.classifier = Preclassifier(self.http if self.scrape_mode == "http" else cookies_session(self.cookie_path), limiter)
+
+    @property
+    def driver(self):
+        return self.session.driver
+
+    @property
+    def wait(self):
+        return self.session.wait
+
+    def ensure_login(self):
+        if self.scrape_mode == "http":
+            with metrics.span("login_check"):
+                logged_in = is_logged_in_http(self.http)
+            if logged_in:
+                print("✅ Успешно авторизован через cookies.")
+                # те же cookies подойдут и браузеру, повторно проверять их не нужно
+                self.session.logged_in = True
+            else:
+                print("⚠️ Cookies невалидны. Поиск продолжится без авторизации — обновите их через --add-account.")
+            print(f"👤 Используется аккаунт: {os.path.basename(self.account_path)}")
+            return
+
+        if not self.account_path or not os.path.exists(os.path.dirname(os.path.abspath(self.account_path))):
+            print("⚠️ Cookies не найдены. Войдите вручную.")
+            self.session.use_profile("login")
+            input("🔐 Войдите и нажмите Enter...")
+            self.cookie_path = add_new_account_cookies(self.driver)
+            self.session.cookie_path = self.cookie_path
+            self.session.cookies_loaded = True
+            self.session.logged_in = True
+        else:
+            self.session.ensure_login()
+        print(f"👤 Используется аккаунт: {os.path.basename(self.account_path)}")
+
+    def is_valid_vacancy(self, title, employer):
+        return not self.stop_words.matches(title, employer)
+
+    def update_url_with_page(self, url, page_number):
+        parsed_url = urlparse(url)
+        query_params = parse_qs(parsed_url.query)
+        query_params["page"] = [str(page_number)]
+        new_query = urlencode(query_params, doseq=True)
+        return urlunparse(parsed_url._replace(query=new_query))
+
+    def sort_by_date(self, url):
+        # в инкрементальном режиме выдача должна идти от новых к старым,
+        # иначе «дошли до известных вакансий» ничего не значит
+        parsed_url = urlparse(url)
+        query_params = parse_qs(parsed_url.query)
+        query_params["order_by"] = [DATE_ORDER]
+        return urlunparse(parsed_url._replace(query=urlencode(query_params, doseq=True)))
+
+    def extract_cards(self):
+        try:
+            cards = self.driver.execute_script(SERP_CARDS_JS, VIEWED_CARD_CLASS)
+            if isinstance(cards, list):
+                return [normalize_card(card) for card in cards]
+            print("⚠️ Пакетное извлечение вернуло неожиданный результат, используем поэлементный режим.")
+        except Exception as e:
+            if is_dead_session_error(e):
+                raise
+            print(f"⚠️ Пакетное извлечение не удалось, используем поэлементный режим: {e}")
+        return self._extract_cards_by_elements()
+
+    def _extract_cards_by_elements(self):
+        cards = []
+        for card in self.driver.find_elements(By.XPATH, VACANCY_CARD_XPATH):
+            raw = {"viewed": bool(card.find_elements(By.CLASS_NAME, VIEWED_CARD_CLASS))}
+            if not raw["viewed"]:
+                try:
+                    raw["title"] = card.find_element(By.XPATH, VACANCY_TITLE_XPATH).text
+                    raw["link"] = card.find_element(By.XPATH, VACANCY_LINK_XPATH).get_attribute("href")
+                    raw["employer"] = card.find_element(By.XPATH, VACANCY_EMPLOYER_XPATH).text
+                    addresses = card.find_elements(By.XPATH, VACANCY_ADDRESS_XPATH)
+                    raw["address"] = addresses[0].text if addresses else None
+                except Exception as e:
+                    if is_dead_session_error(e):
+                        raise
+            cards.append(normalize_card(raw))
+        return cards
+
+    def add_card(self, card, valid=None):
+        if card["viewed"]:
+            print("⏩ Пропущена вакансия — уже просмотрена.")
+            return
+
+        name, employer, href = card["title"], card["employer"], card["link"]
+        if name is None or employer is None or href is None:
+            print(f"⚠️ Ошибка при обработке карточки: не найдены название, работодатель или ссылка ({href})")
+            return
+
+        vacancy = {
+            "title": name,
+            "employer": employer,
+            "link": href,
+            "id": card["id"],
+            "city": card["city"],
+        }
+        # одна и та же вакансия из разных поисковых URL отличается только трекинг-параметрами ссылки
+        key = card["id"] or href
+        if key in self.seen:
+            return
+        self.seen.add(key)
+
+        # история откликов важнее стоп-слов: добавленное позже слово не должно
+        # превращать отправленный отклик в исключённую вакансию
+        if self.index.is_handled(card["id"]):
+            print(f"⏭️ Уже обработана ранее ({self.index.status(card['id'])}): {name} | {employer}")
+            return
+
+        if valid is None:
+            valid = self.is_valid_vacancy(name, employer)
+        if not valid:
+            print(f"❌ Исключена: {name} | {employer}")
+            self.index.mark(vacancy, EXCLUDED)
+            return
+
+        self.index.mark(vacancy, SEEN)
+        self.all_vacancies.append(vacancy)
+        print(f"✅ Найдена вакансия: {name} | {employer}")
+        return vacancy
+
+    def fetch_cards(self, url, with_total: bool = False):
+        # возвращает (карточки, общее число результатов); счётчик нужен только с первой страницы
+        if self.scrape_mode == "http":
+            with metrics.span("page_load", mode="http"):
+                page_html, page_url = fetch_html(self.http, url)
+            with metrics.span("card_extraction", mode="http"):
+                return parse_serp(page_html, page_url)
+
+        # браузер общий с откликером: если Chrome умер на выдаче, поднимаем новый
+        # и повторяем страницу один раз, иначе все оставшиеся URL упадут на первой же странице
+        self.session.check_health()
+        for attempt in (1, 2):
+            try:
+                return self._fetch_cards_browser(url, with_total)
+            except Exception as e:
+                if attempt == 1 and is_dead_session_error(e):
+                    self.session.recycle(f"драйвер не отвечает ({type(e).__name__})")
+                    continue
+                raise
+
+    def _fetch_cards_browser(self, url, with_total: bool):
+        self.session.use_profile("serp")
+        round_trips = self.driver.round_trips
+        with metrics.span("page_load", mode="browser"):
+            self.driver.get(url)
+            self.wait.until(EC.presence_of_all_elements_located((By.XPATH, "//span[@data-qa='serp-item__title-text']")))
+        with metrics.span("card_extraction", mode="browser"):
+            cards = self.extract_cards()
+            total = parse_total(self.driver.execute_script(SERP_TOTAL_JS)) if with_total else None
+        print(f"🔁 Запросов к WebDriver на странице: {self.driver.round_trips - round_trips}")
+        return cards, total
+
+    def throttle(self):
+        # при параллельном обходе темп задаёт общий на аккаунт лимит запросов, а не паузы
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+        else:
+            self.pacer.pause("page")
+
+    def iter_pages(self, base_url, page: int = 0):
+        # сетевая часть обхода URL: (page, cards) по порядку до пустой страницы,
+        # последней по счётчику или уже известной. Ошибка загрузки — элемент (page, None)
+        search_url = self.sort_by_date(base_url) if self.incremental else base_url
+        watermark = self.index.watermark(base_url) if self.incremental else None
+        last_page = None
+        first_page = page
+
+        # page в hh.ru считается с нуля: page=0 — первая страница выдачи
+        while page < self.max_pages and not self.stopped.is_set():
+            if last_page is not None and page > last_page:
+                print(f"🔚 По счётчику результатов страниц больше нет (всего {last_page + 1}).")
+                break
+            url = self.update_url_with_page(search_url, page)
+            self.throttle()
+            print(f"\n🔄 Страница {page + 1}: {url}")
+
+            try:
+                cards, total = self.fetch_cards(url, with_total=page == first_page)
+            except Exception as e:
+                print(f"⚠️ Ошибка на странице: {e}")
+                yield page, None
+                return
+
+            if not cards:
+                print("📭 Вакансии на этой странице отсутствуют. Пропускаем дальнейший парсинг этого URL.")
+                break
+
+            if total is not None and last_page is None:
+                # на странице len(cards) карточек
+                last_page = max(0, math.ceil(total / len(cards)) - 1)
+
+            yield page, cards
+            # останавливаемся, только когда известна вся страница: поднятая вакансия
+            # сохраняет старый номер, но встаёт в выдаче среди новых, и одна такая
+            # карточка в конце страницы ещё не значит, что дальше только старое
+            ids = [int(card["id"]) for card in cards if card["id"] and card["id"].isdigit()]
+            if watermark is not None and ids and max(ids) <= watermark:
+                print("🏁 Дошли до вакансий, которые уже видели в прошлых запусках.")
+                break
+            page += 1
+
+    def collect(self, base_url, pages):
+        # разбор страниц одного URL: дедупликация, стоп-слова, индекс и журнал.
+        # Всегда идёт в одном потоке и в порядке URL, поэтому результат не зависит от параллельности
+        newest = None
+        for page, cards in pages:
+            if cards is None:
+                # URL не отмечается пройденным: --resume начнёт с этой же страницы
+                return
+            ids = [int(card["id"]) for card in cards if card["id"] and card["id"].isdigit()]
+            if ids:
+                newest = max(newest or 0, max(ids))
+
+            # вся страница разбирается до yield: откликер может увести общий драйвер на вакансию
+            excluded = self.stop_words.excluded_indexes([(card["title"], card["employer"]) for card in cards])
+            found = [vacancy for i, card in enumerate(cards) if (vacancy := self.add_card(card, i not in excluded))]
+            if self.classifier and found:
+                self.classifier.submit(found)
+            print(f"📄 Страница {page + 1} обработана. Найдено {len(self.all_vacancies)} вакансий.")
+            if self.journal:
+                self.journal.append({"type": "page", "url": base_url, "page": page, "vacancies": found})
+            yield from found
+
+        if self.incremental and newest:
+            self.index.set_watermark(base_url, newest)
+        if self.journal:
+            self.journal.append({"type": "url_done", "url": base_url})
+
+    def iter_url(self, base_url, page: int = 0):
+        print(f"\n🌐 Парсим URL: {base_url}")
+        yield from self.collect(base_url, self.iter_pages(base_url, page))
+
+    def iter_urls_concurrently(self, targets):
+        # каждый URL листается в своём потоке (не больше self.concurrency сразу) и складывает
+        # страницы в свою очередь; разбираются они здесь, строго по порядку URL
+        pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="serp")
+        queues = [queue.Queue() for _ in targets]
+
+        def walk(base_url, page, pages):
+            try:
+                for item in self.iter_pages(base_url, page):
+                    pages.put(item)
+            except Exception as e:
+                print(f"⚠️ Ошибка при обходе {base_url}: {e}")
+                pages.put((page, None))
+            finally:
+                pages.put(None)
+
+        self.stopped.clear()
+        for (base_url, page), pages in zip(targets, queues):
+            pool.submit(walk, base_url, page, pages)
+        try:
+            for (base_url, _), pages in zip(targets, queues):
+                print(f"\n🌐 Парсим URL: {base_url}")
+                yield from self.collect(base_url, iter(pages.get, None))
+        finally:
+            # откликер мог остановиться раньше (лимит, сигнал) — незапущенные обходы отменяем
+            self.stopped.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def iter_vacancies(self):
+        if self.checkpoint:
+            # сначала то, что прошлый запуск нашёл, но не успел обработать
+            pending = [vacancy for vacancy in self.checkpoint.pending if not self.index.is_handled(vacancy.get("id"))]
+            if pending:
+                print(f"♻️ Продолжаем прошлый запуск: {len(pending)} вакансий ждут отклика.")
+            for vacancy in pending:
+                self.seen.add(vacancy.get("id") or vacancy.get("link"))
+                self.all_vacancies.append(vacancy)
+                yield vacancy
+
+        targets = []
+        for url in self.urls:
+            if self.checkpoint and url in self.checkpoint.done_urls:
+                print(f"⏭️ URL уже пройден в прошлом запуске: {url}")
+                continue
+            targets.append((url, self.checkpoint.next_page(url) if self.checkpoint else 0))
+
+        if self.rate_limiter and len(targets) > 1:
+            yield from self.iter_urls_concurrently(targets)
+            return
+        for url, page in targets:
+            self.pacer.pause("url")
+            yield from self.iter_url(url, page)
+
+    def parse_url(self, base_url):
+        for _ in self.iter_url(base_url):
+            pass
+
+    def run(self):
+        self.ensure_login()
+        for _ in self.iter_vacancies():
+            pass
+        self.index.flush()
+        self.save_vacancies()
+
+    def save_vacancies(self):
+        return self.all_vacancies
+
+    def close(self):
+        if self.classifier:
+            self.classifier.close()
+        self.index.close()
+
+
+class HHResponder(HHScraper):
+    def __init__(self, options, vacancies : list[dict], cookie_path : str, account_name: str, session: BrowserSession = None, index: VacancyIndex = None, pacer: Pacer = None, journal: Journal = None, max_applied: int = None, stop_event=None, respond_mode: str = "browser", classifier: Preclassifier = None):
+        self.options = options
+        settings = load_account_settings(account_name)
+        self.response_text = settings.vacancy_text
+        self.letter = LetterTemplate(self.response_text)
+        self.resume_hash = settings.resume_hash
+        self.respond_mode = respond_mode
+        # в HTTP режиме отклик — один POST; браузер нужен только для неожиданных ответов
+        self.http = cookies_session(cookie_path) if respond_mode == "http" else None
+        self.vacancies = vacancies
+        self.session = session or BrowserSession(options, cookie_path)
+        self.index = index or VacancyIndex(get_vacancy_index_path(account_name))
+        self.pacer = pacer or Pacer(settings.pacing)
+        self.journal = journal
+        self.classifier = classifier
+        # лимит откликов на этот проход и флаг остановки — для режима --daemon
+        self.max_applied = max_applied
+        self.stop_event = stop_event
+        self.redirected_responses = []
+        self.applied_responses = []
+        self.limit_reached = False
+        self.interrupted = False
+        self.started = False
+        self.cookie_path = cookie_path
+        self.account_name = account_name
+
+    def start(self):
+        if self.session.ensure_login():
+            print("✅ Успешно авторизован через cookies.")
+        self.started = True
+
+    def _click_first_button(self):
+        # (нажата, редирект, ошибка лимита)
+        try:
+            initial_url = self.driver.current_url
+            button = self.wait.until(EC.element_to_be_clickable(
+                (By.XPATH, "//a[@data-qa='vacancy-response-link-top']")
+            ))
+            self.driver.execute_script(CLICK_AND_MARK_JS, button)
+
+            print("✅ Первая кнопка нажата")
+            # ждём реакцию страницы: переход, попап, ошибку лимита или затишье сети
+            try:
+                self.fast_wait.until(EC.any_of(
+                    EC.url_changes(initial_url),
+                    EC.presence_of_element_located((By.CSS_SELECTOR, TEXTAREA_WRAPPER)),
+                    EC.presence_of_element_located((By.XPATH, SUBMIT_BUTTON_XPATH)),
+                    EC.presence_of_element_located((By.CSS_SELECTOR, COUNTRY_ALERT)),
+                    EC.visibility_of_element_located((By.XPATH, RESPONSE_ERROR_XPATH)),
+                    network_idle(),
+                ))
+            except selenium_exceptions.TimeoutException:
+                pass
+
+            current_url = self.driver.current_url
+            was_redirected = initial_url != current_url
+            has_error = self._has_response_error()
+
+            return True, was_redirected, has_error
+
+        except Exception as e:
+            if is_dead_session_error(e):
+                raise
+            print(f"⚠️ Ошибка при нажатии кнопки 'Откликнуться': {e}")
+            return False, False, False
+
+
+    def _fill_response_text(self, text):
+        try:
+            # всё письмо одним execute_script вместо посимвольного send_keys
+            if self.driver.execute_script(FILL_TEXTAREA_JS, f"{TEXTAREA_WRAPPER} textarea", text) == text:
+                print("✅ Текст отклика вставлен в поле.")
+                return True
+            wrapper = self.wait.until(EC.presence_of_element_located(
+                (By.CSS_SELECTOR, TEXTAREA_WRAPPER)))
+            textarea = wrapper.find_element(By.TAG_NAME, "textarea")
+            textarea.clear()
+            textarea.send_keys(text)
+            print("✅ Текст отклика введён в поле.")
+            return True
+        except Exception as e:
+            if is_dead_session_error(e):
+                raise
+            print(f"⚠️ Не удалось найти и заполнить textarea: {e}")
+            return False
+
+    def _has_response_error(self):
+        try:
+            error_div = self.driver.find_element(By.XPATH, RESPONSE_ERROR_XPATH)
+            if error_div.is_displayed():
+                return True
+            return False
+        except Exception as e:
+            if is_dead_session_error(e):
+                raise
+            return False
+
+
+    def _click_second_button(self):
+        try:
+            button = self.wait.until(EC.element_to_be_clickable((By.XPATH, SUBMIT_BUTTON_XPATH)))
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();", button)
+            print(f"🎯 Кнопка сопроводительного письма нажата.")
+            self.wait.until(EC.invisibility_of_element_located((By.XPATH, SUBMIT_BUTTON_XPATH)))
+            print(f"✅ Сопроводительное письмо отправлено.")
+            return True
+        except Exception as e:
+            if is_dead_session_error(e):
+                raise
+            print(f"⚠️ Кнопка сопроводительного письма не нажалась. Ошибка: {e}")
+            return False
+
+    def _click_relocation_warning_confirm(self):
+        try:
+            button = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[@data-qa='relocation-warning-confirm']")))
+            self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
+            button.click()
+            print("✅ Кнопка подтверждения релокации нажата.")
+            return True
+        except Exception as e:
+            if is_dead_session_error(e):
+                raise
+            print(f"⚠️ Кнопка подтверждения релокации не найдена или не нажалась: {e}")
+            return False
+
+    def _has_textarea(self):
+        try:
+            # поле письма либо появится, либо страница успокоится без него
+            self.wait.until(EC.any_of(
+                EC.presence_of_element_located((By.CSS_SELECTOR, TEXTAREA_WRAPPER)),
+                network_idle(1.0),
+            ))
+            return bool(self.driver.find_elements(By.CSS_SELECTOR, f"{TEXTAREA_WRAPPER} textarea"))
+        except Exception as e:
+            if is_dead_session_error(e):
+                raise
+            return False
+
+    def _has_country_alert(self):
+        try:
+            WebDriverWait(self.driver, 0.2).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, COUNTRY_ALERT))
+            )
+            alert_div = self.driver.find_element(By.CSS_SELECTOR, COUNTRY_ALERT)
+            return alert_div.is_displayed()
+        except Exception as e:
+            if is_dead_session_error(e):
+                raise
+            return False
+
+
+    def skip_classified(self, vacancy, count):
+        # вакансии, которые предклассификатор уже разобрал по HTTP, браузер не открывает
+        verdict = vacancy.get("verdict")
+        if verdict in REDIRECT_VERDICTS:
+            print(f"🚫 [{count}] Пропущена без браузера — {VERDICT_LABELS[verdict]}: {vacancy['title']} | {vacancy['employer']}")
+            self.redirected_responses.append(vacancy)
+            self.index.mark(vacancy, REDIRECTED)
+            return "redirected"
+        if verdict == ALREADY_RESPONDED:
+            print(f"⏭️ [{count}] Пропущена — {VERDICT_LABELS[verdict]}: {vacancy['title']} | {vacancy['employer']}")
+            self.index.mark(vacancy, RESPONDED)
+            return "responded"
+        return None
+
+    def respond_http(self, vacancy, count):
+        # None — ответ не распознан, отклик повторяется через браузер
+        print(f"\n➡️ [{count}] Отклик по HTTP: {vacancy['title']} | {vacancy['employer']}")
+        if not vacancy.get("id"):
+            return None
+        try:
+            with metrics.span("respond.http"):
+                status, body = submit_response(self.http, vacancy["id"], self.letter.render(vacancy), self.resume_hash)
+        except requests.RequestException as e:
+            print(f"↩️ [{count}] HTTP отклик не отправлен ({e}), пробуем через браузер.")
+            return None
+        # отправленным считаем только явный success: 200 с пустым телом бывает и у страницы входа
+        if status == 200 and body.get("success") and not body.get("error"):
+            print(f"✅ [{count}] Отклик отправлен.")
+            self.applied_responses.append(vacancy)
+            self.index.mark(vacancy, APPLIED)
+            return "applied"
+        if body.get("error") == LIMIT_ERROR:
+            print("🛑 В течение 24 часов можно совершить не более 200 откликов. Вы исчерпали лимит откликов, попробуйте отправить отклик позднее.")
+            return "limit"
+        print(f"↩️ [{count}] HTTP отклик не прошёл ({status} {body.get('error', '')}), пробуем через браузер.")
+        return None
+
+    def fail(self, vacancy, count):
+        # отклик не ушёл: вакансия остаётся в очереди на следующий запуск и не тратит квоту
+        print(f"⚠️ [{count}] Отклик не отправлен: {vacancy['title']} | {vacancy['employer']}")
+        self.index.mark(vacancy, ERRORED)
+        return ERRORED
+
+    def respond_supervised(self, vacancy, count):
+        # перед вакансией проверяем пороги перезапуска Chrome; если драйвер умер
+        # посреди отклика — поднимаем новый и повторяем ту же вакансию один раз
+        self.session.check_health()
+        for attempt in (1, 2):
+            try:
+                status = self.respond(vacancy, count)
+                break
+            except Exception as e:
+                if attempt == 1 and is_dead_session_error(e):
+                    self.session.recycle(f"драйвер не отвечает ({type(e).__name__})")
+                    continue
+                print(f"⚠️ [{count}] Ошибка при отклике: {e}")
+                self.index.mark(vacancy, ERRORED)
+                status = ERRORED
+                break
+        if self.session.started:
+            self.session.record_result(status != ERRORED)
+        return status
+
+    def respond(self, vacancy, count):
+        self.pacer.pause("vacancy")
+        if self.respond_mode == "http":
+            status = self.respond_http(vacancy, count)
+            if status:
+                return status
+        if not self.started:
+            self.start()
+        print(f"\n➡️ [{count}] Открываем вакансию: {vacancy['title']} | {vacancy['employer']}")
+        self.session.use_profile("vacancy")
+        with metrics.span("respond.open"):
+            self.driver.get(vacancy['link'])
+
+        with metrics.span("respond.first_click"):
+            clicked, was_redirected, has_error = self._click_first_button()
+
+        if has_error:
+            print("🛑 В течение 24 часов можно совершить не более 200 откликов. Вы исчерпали лимит откликов, попробуйте отправить отклик позднее.")
+            return "limit"
+
+        if was_redirected:
+            print(f"🚫 [{count}] Пропущена — редирект на другую страницу.")
+            self.redirected_responses.append(vacancy)
+            self.index.mark(vacancy, REDIRECTED)
+            return "redirected"
+
+        if not clicked:
+            return self.fail(vacancy, count)
+
+        with metrics.span("respond.country_alert"):
+            # вердикт классификатора только подтверждает релокацию: на hh.ru предупреждение —
+            # модальное окно после клика, по HTML страницы его видно не всегда
+            relocation = vacancy.get("verdict") == RELOCATION or self._has_country_alert()
+            if relocation:
+                print("🌍 Обнаружено предупреждение о стране.")
+                self._click_relocation_warning_confirm()
+
+        with metrics.span("respond.textarea"):
+            has_textarea = self._has_textarea()
+        if has_textarea:
+            if not self.letter:
+                print("⚠️ Текст отклика не задан. Будет отправлен простой отклик.")
+            else:
+                print("📝 Обнаружено поле для ввода текста.")
+                with metrics.span("respond.fill"):
+                    filled = self._fill_response_text(self.letter.render(vacancy))
+                if not filled:
+                    return self.fail(vacancy, count)
+                with metrics.span("respond.submit"):
+                    submitted = self._click_second_button()
+                if not submitted:
+                    return self.fail(vacancy, count)
+        else:
+            print("📭 Поле для текста не найдено. Будет отправлен простой отклик.")
+
+        self.applied_responses.append(vacancy)
+        self.index.mark(vacancy, APPLIED)
+        return "applied"
+
+    def respond_to_all(self):
+        # self.vacancies может быть генератором: отклики идут по мере парсинга,
+        # и всё уже отправленное остаётся отправленным, даже если запуск оборвётся
+        count = 0
+        try:
+            for vacancy in self.vacancies:
+                if self.stop_event is not None and self.stop_event.is_set():
+                    self.interrupted = True
+                    break
+                count += 1
+                if self.index.is_handled(vacancy.get("id")):
+                    print(f"⏭️ [{count}] Уже обработана ранее: {vacancy['title']} | {vacancy['employer']}")
+                    continue
+                if self.classifier:
+                    self.classifier.resolve(vacancy)
+                status = self.skip_classified(vacancy, count)
+                if status is None:
+                    status = self.respond_supervised(vacancy, count)
+                if status == "limit":
+                    self.limit_reached = True
+                    self.quit()
+                    break
+                if self.journal:
+                    self.journal.append({"type": "response", "id": vacancy.get("id"), "status": status}, sync=True)
+                if self.max_applied is not None and len(self.applied_responses) >= self.max_applied:
+                    print(f"🎯 Лимит откликов на этот проход исчерпан ({self.max_applied}).")
+                    self.interrupted = True
+                    break
+        finally:
+            self.index.flush()
+            close = getattr(self.vacancies, "close", None)
+            if close:
+                close()
+            if self.redirected_responses:
+                print("\n🔁 Вакансии, которые редиректят на другие сайты:")
+                for v in self.redirected_responses:
+                    print(f"🔗 {v['title']} | {v['employer']} | {v['link']}")
+            if count:
+                print(f"\n📊 Обработано {count} вакансий: откликов {len(self.applied_responses)}, редиректов {len(self.redirected_responses)}.")
+
+    @property
+    def fast_wait(self):
+        return WebDriverWait(self.driver, 15, poll_frequency=0.1)
+
+    def quit(self):
+        self.session.quit()
@@ -0,0 +1,96 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from lxml import etree, html as lxml_html
+from http_client import fetch_html
+from metrics import metrics
+
+# Предварительная классификация вакансий по HTTP: страницы вакансий скачиваются
+# параллельно с откликами, и откликер заранее знает, куда браузер идти не должен.
+# Признаки — те же data-qa, что на странице вакансии hh.ru (и на bench/stand.py)
+
+APPLICABLE = "applicable"
+EXTERNAL = "external"
+QUESTIONNAIRE = "questionnaire"
+RESPONDED = "responded"
+RELOCATION = "relocation"
+
+# с такими вакансиями браузеру делать нечего: откликнуться можно только вне hh.ru или через анкету
+REDIRECT_VERDICTS = {EXTERNAL, QUESTIONNAIRE}
+VERDICT_LABELS = {
+    EXTERNAL: "отклик на сайте работодателя",
+    QUESTIONNAIRE: "работодатель просит заполнить анкету",
+    RESPONDED: "отклик уже был отправлен",
+    RELOCATION: "вакансия в другой стране",
+}
+
+RESPONSE_PATH_PREFIX = "/applicant/vacancy_response"
+
+_response_link_xpath = etree.XPath("//a[@data-qa='vacancy-response-link-top']")
+_responded_xpath = etree.XPath("//*[@data-qa='vacancy-response-link-view-topic']")
+_questionnaire_xpath = etree.XPath("//*[@data-qa='employer-asking-for-test']")
+_relocation_xpath = etree.XPath("//*[@data-qa='vacancy-relocation-warning']")
+
+
+def classify_html(page_html: str, page_url: str):
+    # None — признаков не нашлось вовсе (страница не та или разметка поменялась),
+    # тогда откликер действует как без классификации
+    if not page_html.strip():
+        return None
+    tree = lxml_html.fromstring(page_html)
+    if _responded_xpath(tree):
+        return RESPONDED
+    links = _response_link_xpath(tree)
+    if not links:
+        return None
+    target = urlparse(links[0].get("href") or "")
+    if (target.netloc and target.netloc != urlparse(page_url).netloc) or not target.path.startswith(RESPONSE_PATH_PREFIX):
+        return EXTERNAL
+    if _questionnaire_xpath(tree):
+        return QUESTIONNAIRE
+    if _relocation_xpath(tree):
+        return RELOCATION
+    return APPLICABLE
+
+
+class Preclassifier:
+    # страницы вакансий скачиваются в фоне, пока откликер занят предыдущими вакансиями:
+    # submit() вызывается при разборе страницы выдачи, resolve() — перед откликом
+    def __init__(self, http, rate_limiter=None, workers: int = 8):
+        self.http = http
+        # свой лимит запросов: страницы вакансий не должны ни засыпать hh.ru, ни тормозить выдачу
+        self.rate_limiter = rate_limiter
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="classify")
+        self.futures = {}
+        self.lock = threading.Lock()
+
+    def classify(self, vacancy: dict):
+        try:
+            if self.rate_limiter:
+                self.rate_limiter.wait()
+            with metrics.span("preclassify"):
+                page_html, page_url = fetch_html(self.http, vacancy["link"])
+                return classify_html(page_html, page_url)
+        except Exception as e:
+            print(f"⚠️ Не удалось заранее проверить вакансию {vacancy['link']}: {e}")
+            return None
+
+    def submit(self, vacancies: list[dict]):
+        with self.lock:
+            for vacancy in vacancies:
+                self.futures[vacancy["link"]] = self.executor.submit(self.classify, vacancy)
+
+    def resolve(self, vacancy: dict):
+        # ещё не начатую проверку отменяем — ждать очереди дольше, чем открыть вакансию в браузере;
+        # начатую дожидаемся (не дольше таймаута запроса). Вердикт кладётся в сам словарь вакансии
+        with self.lock:
+            future = self.futures.pop(vacancy.get("link"), None)
+        if future is None or future.cancel():
+            return vacancy.get("verdict")
+        verdict = future.result()
+        if verdict is not None:
+            vacancy["verdict"] = verdict
+        return verdict
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,88 @@
+import signal
+import threading
+import time
+from accounts import select_account
+from runner import make_session, make_scraper, run_cycle
+from metrics import metrics
+from pacing import Pacer
+from quota import ResponseQuota
+
+# Долгоживущий режим: один прогретый Chrome на все циклы, суточная квота hh.ru
+# считается локально по индексу вакансий и делится поровну между циклами.
+#   python main.py --daemon --daemon-interval=30 --headless
+
+
+def install_stop_handlers(stop: threading.Event):
+    # первый сигнал — мягкая остановка после текущей вакансии, второй — немедленная
+    def handle(signum, frame):
+        if stop.is_set():
+            raise KeyboardInterrupt
+        print(f"\n🛑 Получен сигнал {signal.Signals(signum).name}, завершаем после текущей вакансии...")
+        stop.set()
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, handle)
+
+
+def format_time(timestamp: float) -> str:
+    return time.strftime("%d.%m %H:%M:%S", time.localtime(timestamp))
+
+
+def run_daemon(account_id, args, interactive=True):
+    # аккаунт выбирается один раз: без --account select_account спрашивает номер через input()
+    account_name = select_account(account_id)
+    totals = {"account": account_name, "found": 0, "applied": 0, "redirected": 0}
+    if account_name is None:
+        print("❌ Аккаунт для режима --daemon не выбран.")
+        return totals
+    stop = threading.Event()
+    install_stop_handlers(stop)
+    interval = args.daemon_interval * 60
+    session = make_session(args, interactive)
+    pacer = Pacer(args.pacing) if args.pacing else None
+    quota = ResponseQuota(limit=args.daily_limit)
+    cycle = 0
+
+    try:
+        while not stop.is_set():
+            started = time.time()
+            # настройки и стоп-слова перечитываются каждый цикл, браузер остаётся тем же
+            scraper = make_scraper(account_id, args, session, pacer, interactive, account_name=account_name)
+            try:
+                quota.sync(scraper.index.applied_since(started - quota.window))
+                budget = quota.cycle_budget(interval)
+                if budget:
+                    cycle += 1
+                    print(f"\n🔁 Цикл {cycle}: можно отправить {budget} откликов (в окне 24 ч осталось {quota.remaining()} из {quota.limit}).")
+                    # авторизацию проверяем заново: за время сна cookies могли протухнуть
+                    session.logged_in = None
+                    try:
+                        responder = run_cycle(scraper, session, args, resume=args.resume and cycle == 1, max_applied=budget, stop_event=stop)
+                    except RuntimeError:
+                        # невалидные cookies без возможности ручного входа — ждать бесполезно
+                        raise
+                    except Exception as e:
+                        print(f"⚠️ Цикл {cycle} прерван ошибкой: {e}")
+                        session.quit()
+                    else:
+                        if responder.limit_reached:
+                            quota.exhausted()
+                        totals["found"] += len(scraper.all_vacancies)
+                        totals["applied"] += len(responder.applied_responses)
+                        totals["redirected"] += len(responder.redirected_responses)
+                    quota.sync(scraper.index.applied_since(time.time() - quota.window))
+            finally:
+                scraper.close()
+
+            # квота выбрана — спим ровно до освобождения отклика, иначе до следующего цикла
+            wake_at = max(started + interval, quota.next_free_at()) if budget else quota.next_free_at()
+            if not stop.is_set():
+                print(f"😴 Следующий цикл {format_time(wake_at)}; откликов в окне 24 ч: {len(quota.sent)} из {quota.limit}.")
+            stop.wait(max(0.0, wake_at - time.time()))
+    finally:
+        session.quit()
+        metrics.print_summary()
+        metrics.close()
+        print(f"👋 Демон остановлен: циклов {cycle}, откликов {totals['applied']}.")
+
+    return totals
@@ -0,0 +1,292 @@
+import os
+from collections import deque
+from functools import cache
+from lazy import LazyImport
+from accounts import save_cookies, load_cookies, read_cookies, HH_URL
+from http_client import USER_AGENT
+from waits import install_network_idle
+from metrics import metrics
+
+webdriver = LazyImport("selenium.webdriver")
+Options = LazyImport("selenium.webdriver.chrome.options", "Options")
+By = LazyImport("selenium.webdriver.common.by", "By")
+WebDriverWait = LazyImport("selenium.webdriver.support.ui", "WebDriverWait")
+EC = LazyImport("selenium.webdriver.support.expected_conditions")
+
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly")
+
+# пороги перезапуска Chrome на длинных прогонах: память процессов браузера,
+# число загруженных страниц и доля ошибок среди последних откликов
+RECYCLE_RSS_MB = 1500
+RECYCLE_PAGES = 300
+RECYCLE_ERROR_RATE = 0.5
+ERROR_WINDOW = 20
+RSS_CHECK_EVERY = 10
+DEAD_SESSION_MARKERS = ("disconnected", "not reachable", "session deleted", "no such window", "target window already closed", "max retries exceeded", "connection refused")
+
+# группы ресурсов, которые боту не нужны; шаблоны в формате Network.setBlockedURLs
+RESOURCE_GROUPS = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.ogg"],
+    "analytics": [
+        "*mc.yandex.ru/*", "*google-analytics.com/*", "*googletagmanager.com/*",
+        "*top-fwz1.mail.ru/*", "*vk.com/rtrg*", "*counter.yadro.ru/*",
+    ],
+    "ads": ["*doubleclick.net/*", "*adfox.ru/*", "*an.yandex.ru/*", "*yandex.ru/ads/*", "*criteo.com/*"],
+}
+
+# что разрешено на страницах каждого типа; всё остальное из RESOURCE_GROUPS блокируется.
+# login — ручной вход, там нужна капча и вообще всё как в обычном браузере
+PAGE_ALLOWLISTS = {
+    "serp": set(),
+    "vacancy": set(),
+    "login": set(RESOURCE_GROUPS),
+}
+
+
+def blocked_urls(page_type: str, allowlists: dict = None) -> list[str]:
+    allowed = (allowlists or PAGE_ALLOWLISTS).get(page_type, set(RESOURCE_GROUPS))
+    return [pattern for group, patterns in RESOURCE_GROUPS.items() if group not in allowed for pattern in patterns]
+
+
+def descendants_rss_mb(root_pid: int = None):
+    # суммарная память процесса и всех его потомков: для chromedriver это весь Chrome
+    root_pid = root_pid or os.getpid()
+    try:
+        parents = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat", "r") as f:
+                        parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    tree, frontier = set(), {root_pid}
+    while frontier:
+        frontier = {pid for pid, parent in parents.items() if parent in frontier} - tree
+        tree |= frontier
+    total = 0
+    for pid in tree | {root_pid}:
+        try:
+            with open(f"/proc/{pid}/statm", "r") as f:
+                total += int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except OSError:
+            continue
+    return round(total / (1024 * 1024), 1)
+
+
+def is_dead_session_error(error: BaseException) -> bool:
+    # ошибки, после которых этим драйвером пользоваться уже нельзя
+    from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, WebDriverException
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return True
+    if isinstance(error, (WebDriverException, OSError)) or "urllib3" in type(error).__module__:
+        message = str(error).lower()
+        return any(marker in message for marker in DEAD_SESSION_MARKERS)
+    return False
+
+
+@cache
+def counting_chrome():
+    # класс создаётся при первом запуске браузера, чтобы не импортировать Selenium заранее
+    from selenium.webdriver.remote.command import Command
+
+    class CountingChrome(webdriver.Chrome):
+        # каждый вызов execute — это отдельный HTTP запрос к chromedriver,
+        # поэтому счётчик показывает реальное число round trip'ов
+        def __init__(self, *args, **kwargs):
+            self.round_trips = 0
+            self.pages = 0
+            super().__init__(*args, **kwargs)
+
+        def execute(self, driver_command, params=None):
+            self.round_trips += 1
+            if driver_command == Command.GET:
+                self.pages += 1
+            return super().execute(driver_command, params)
+
+        @property
+        def rss_mb(self):
+            try:
+                return descendants_rss_mb(self.service.process.pid)
+            except AttributeError:
+                return None
+
+    return CountingChrome
+
+
+class BrowserSession:
+    # один Chrome на весь запуск: парсер и откликер берут драйвер отсюда,
+    # а проверка авторизации выполняется один раз и кешируется
+    def __init__(self, options=None, cookie_path: str = None, block_resources: bool = False, page_load_strategy: str = None, allowlists: dict = None, profile_dir: str = None, interactive: bool = True,
+                 recycle_rss_mb: float = RECYCLE_RSS_MB, recycle_pages: int = RECYCLE_PAGES, recycle_error_rate: float = RECYCLE_ERROR_RATE):
+        self.options = options
+        self.cookie_path = cookie_path
+        self.profile_dir = profile_dir
+        self.interactive = interactive
+        self.block_resources = block_resources
+        self.page_load_strategy = page_load_strategy
+        self.allowlists = allowlists or PAGE_ALLOWLISTS
+        self.page_type = None
+        self.logged_in = None
+        self.cookies_loaded = False
+        self.recycle_rss_mb = recycle_rss_mb
+        self.recycle_pages = recycle_pages
+        self.recycle_error_rate = recycle_error_rate
+        self.results = deque(maxlen=ERROR_WINDOW)
+        self.rss_checked_at = 0
+        self.recycles = 0
+        self._driver = None
+        self._wait = None
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            with metrics.span("driver_launch"):
+                self._driver = self.launch()
+            self._wait = WebDriverWait(self._driver, 15)
+        return self._driver
+
+    @property
+    def wait(self):
+        self.driver
+        return self._wait
+
+    @property
+    def started(self):
+        return self._driver is not None
+
+    def launch(self):
+        if self.options is None:
+            self.options = Options()
+        arguments = ["--disable-blink-features=AutomationControlled", f"user-agent={USER_AGENT}"]
+        if self.profile_dir:
+            # отдельный профиль Chrome на аккаунт, чтобы параллельные браузеры не делили состояние
+            arguments.append(f"--user-data-dir={self.profile_dir}")
+        for argument in arguments:
+            if argument not in self.options.arguments:
+                self.options.add_argument(argument)
+        if self.page_load_strategy:
+            # eager: driver.get возвращается после DOMContentLoaded, дальше работают явные ожидания
+            self.options.page_load_strategy = self.page_load_strategy
+        driver = counting_chrome()(options=self.options)
+        install_network_idle(driver)
+        if self.block_resources:
+            driver.execute_cdp_cmd("Network.enable", {})
+        return driver
+
+    def use_profile(self, page_type: str):
+        # переключаем список блокировок только при смене типа страницы — это лишний round trip
+        if not self.block_resources or page_type == self.page_type:
+            return
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls(page_type, self.allowlists)})
+        self.page_type = page_type
+
+    def load_cookies(self):
+        cookies = read_cookies(self.cookie_path)
+        try:
+            # Network.setCookies ставит все cookies одним запросом и без захода на главную
+            params = []
+            for cookie in cookies:
+                param = {key: cookie[key] for key in COOKIE_FIELDS if key in cookie}
+                if "expiry" in cookie:
+                    param["expires"] = cookie["expiry"]
+                params.append(param)
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+        except Exception:
+            load_cookies(self.driver, self.cookie_path)
+        self.cookies_loaded = True
+
+    def is_logged_in(self):
+        self.use_profile("serp")
+        self.driver.get(HH_URL)
+        try:
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-qa="multiaccount-infotip"]')))
+            return True
+        except:
+            return False
+
+    def ensure_login(self):
+        if not self.cookies_loaded and self.cookie_path and os.path.exists(self.cookie_path):
+            try:
+                with metrics.span("cookie_load"):
+                    self.load_cookies()
+            except Exception as e:
+                print("⚠️ Ошибка при загрузке cookies:", e)
+        if self.logged_in is None:
+            with metrics.span("login_check"):
+                self.logged_in = self.cookies_loaded and self.is_logged_in()
+        if not self.logged_in:
+            if not self.interactive:
+                raise RuntimeError(f"Cookies невалидны, нужен ручной вход: обновите их через --add-account ({self.cookie_path})")
+            self.use_profile("login")
+            if not self.cookies_loaded:
+                self.driver.get(HH_URL)
+            print("⚠️ Cookies невалидны. Войдите вручную.")
+            input("🔐 Войдите и нажмите Enter...")
+            save_cookies(self.driver, self.cookie_path)
+            print(f"💾 Cookies обновлены в {self.cookie_path}")
+            self.logged_in = True
+        return self.logged_in
+
+    def record_result(self, ok: bool):
+        self.results.append(ok)
+
+    def error_rate(self) -> float:
+        if len(self.results) < self.results.maxlen // 2:
+            return 0.0
+        return self.results.count(False) / len(self.results)
+
+    def recycle_reason(self):
+        if self._driver is None:
+            return None
+        pages = self._driver.pages
+        if self.recycle_pages and pages >= self.recycle_pages:
+            return f"загружено {pages} страниц"
+        if self.recycle_error_rate and self.error_rate() >= self.recycle_error_rate:
+            return f"ошибок {self.error_rate():.0%} среди последних {len(self.results)} вакансий"
+        # обход /proc не бесплатный, поэтому память смотрим раз в несколько страниц
+        if self.recycle_rss_mb and pages - self.rss_checked_at >= RSS_CHECK_EVERY:
+            self.rss_checked_at = pages
+            rss = self._driver.rss_mb
+            if rss and rss >= self.recycle_rss_mb:
+                return f"Chrome занимает {rss:.0f} МБ"
+        return None
+
+    def check_health(self):
+        reason = self.recycle_reason()
+        if reason:
+            self.recycle(reason)
+
+    def recycle(self, reason: str):
+        # новый Chrome с теми же cookies: вход уже подтверждён, повторная проверка не нужна
+        self.recycles += 1
+        print(f"♻️ Перезапускаем браузер ({self.recycles}-й раз за запуск): {reason}.")
+        if self._driver is not None and self.cookie_path:
+            try:
+                save_cookies(self._driver, self.cookie_path)
+            except Exception:
+                pass
+        with metrics.span("driver_recycle"):
+            try:
+                self.quit()
+            except Exception:
+                self._driver = None
+                self._wait = None
+                self.page_type = None
+                self.cookies_loaded = False
+            self.results.clear()
+            self.rss_checked_at = 0
+            if self.logged_in:
+                self.ensure_login()
+
+    def quit(self):
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+            self._wait = None
+            self.page_type = None
+            self.cookies_loaded = False
@@ -0,0 +1,74 @@
+from accounts import read_cookies, HH_URL
+from lazy import LazyImport
+
+requests = LazyImport("requests")
+HTTPAdapter = LazyImport("requests.adapters", "HTTPAdapter")
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+LOGGED_IN_MARKER = 'data-qa="multiaccount-infotip"'
+# тот же запрос, что отправляет кнопка «Откликнуться» в попапе вакансии
+RESPONSE_PATH = "/applicant/vacancy_response/popup"
+XSRF_COOKIE = "_xsrf"
+LIMIT_ERROR = "negotiations-limit-exceeded"
+
+
+def cookies_session(cookie_path: str, pool_size: int = 10) -> "requests.Session":
+    session = requests.Session()
+    # keep-alive пул: все страницы одного хоста идут по уже открытым соединениям
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "ru-RU,ru;q=0.9,en;q=0.8",
+    })
+    for cookie in read_cookies(cookie_path):
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/"),
+            secure=cookie.get("secure", False),
+        )
+    return session
+
+
+def fetch_html(session: "requests.Session", url: str, timeout: float = 15) -> tuple[str, str]:
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text, response.url
+
+
+def is_logged_in(session: "requests.Session") -> bool:
+    try:
+        html, _ = fetch_html(session, HH_URL)
+        return LOGGED_IN_MARKER in html
+    except requests.RequestException:
+        return False
+
+
+def cookie_value(session: "requests.Session", name: str):
+    # cookies.get падает, если одноимённые cookies стоят на hh.ru и .hh.ru
+    for cookie in session.cookies:
+        if cookie.name == name:
+            return cookie.value
+    return None
+
+
+def submit_response(session: "requests.Session", vacancy_id: str, letter: str, resume_hash: str = None, timeout: float = 15) -> tuple[int, dict]:
+    data = {"vacancy_id": vacancy_id, "letter": letter, "lux": "true", "ignore_postponed": "true"}
+    if resume_hash:
+        data["resume_hash"] = resume_hash
+    headers = {
+        "X-Xsrftoken": cookie_value(session, XSRF_COOKIE) or "",
+        "X-Requested-With": "XMLHttpRequest",
+        "Referer": f"{HH_URL}/vacancy/{vacancy_id}",
+    }
+    # редирект здесь означает протухшую сессию (hh.ru уводит на страницу входа), а не отклик
+    response = session.post(f"{HH_URL}{RESPONSE_PATH}", data=data, headers=headers, timeout=timeout, allow_redirects=False)
+    try:
+        body = response.json()
+    except ValueError:
+        body = {}
+    return response.status_code, body if isinstance(body, dict) else {}
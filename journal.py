@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+import time
+
+KEEP_RUNS = 10
+
+
+class Journal:
+    # журнал запуска: append-only JSON lines в accounts/<имя>/runs/<run>.jsonl.
+    # Записи копятся в памяти и сбрасываются на диск с fsync пачками,
+    # sync=True сбрасывает сразу (отклики — их нельзя потерять и отправить повторно)
+    def __init__(self, path: str, flush_every: int = 20, flush_interval: float = 5.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.flushed_at = time.monotonic()
+        self.lock = threading.Lock()
+        self.file = open(path, "a", encoding="utf-8")
+
+    def append(self, record: dict, sync: bool = False):
+        line = json.dumps({"ts": round(time.time(), 3), **record}, ensure_ascii=False) + "\n"
+        with self.lock:
+            self.buffer.append(line)
+            if sync or len(self.buffer) >= self.flush_every or time.monotonic() - self.flushed_at >= self.flush_interval:
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            self.file.write("".join(self.buffer))
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.buffer = []
+        self.flushed_at = time.monotonic()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+
+def read_journal(path: str) -> list[dict]:
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # последняя строка могла оборваться при падении
+                break
+    return records
+
+
+class Checkpoint:
+    def __init__(self, records: list[dict]):
+        self.pages = {}
+        self.done_urls = set()
+        self.finished = False
+        responded = set()
+        scraped = []
+        for record in records:
+            kind = record.get("type")
+            if kind == "page":
+                self.pages[record["url"]] = max(self.pages.get(record["url"], 0), record["page"])
+                scraped.extend(record.get("vacancies", []))
+            elif kind == "url_done":
+                self.done_urls.add(record["url"])
+            elif kind == "response":
+                responded.add(record["id"])
+            elif kind == "finish":
+                self.finished = True
+        # найденные, но ещё не обработанные откликером вакансии
+        self.pending = [vacancy for vacancy in scraped if vacancy.get("id") not in responded]
+
+    def next_page(self, url: str) -> int:
+        return self.pages.get(url, -1) + 1
+
+
+def list_runs(runs_dir: str) -> list[str]:
+    if not os.path.isdir(runs_dir):
+        return []
+    return sorted(os.path.join(runs_dir, name) for name in os.listdir(runs_dir) if name.endswith(".jsonl"))
+
+
+def open_run(runs_dir: str, resume: bool = False):
+    # возвращает (журнал, чекпоинт или None). При --resume дописываем в последний
+    # незавершённый журнал, иначе начинаем новый и чистим старые
+    os.makedirs(runs_dir, exist_ok=True)
+    runs = list_runs(runs_dir)
+    if resume and runs:
+        checkpoint = Checkpoint(read_journal(runs[-1]))
+        if not checkpoint.finished:
+            return Journal(runs[-1]), checkpoint
+        print("ℹ️ Последний запуск завершился полностью — продолжать нечего, начинаем заново.")
+    elif resume:
+        print("ℹ️ Журналов прошлых запусков нет — начинаем заново.")
+
+    for path in runs[:max(0, len(runs) - KEEP_RUNS + 1)]:
+        os.remove(path)
+    return Journal(os.path.join(runs_dir, f"{int(time.time() * 1000)}.jsonl")), None
@@ -0,0 +1,24 @@
+import importlib
+
+
+class LazyImport:
+    # модуль (или имя из модуля), который импортируется при первом обращении.
+    # Selenium грузится дольше всего остального вместе взятого, а --accounts,
+    # --help и HTTP режимам он не нужен:
+    #   By = LazyImport("selenium.webdriver.common.by", "By")
+    def __init__(self, module: str, name: str = None):
+        self._module = module
+        self._name = name
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            target = importlib.import_module(self._module)
+            self._target = getattr(target, self._name) if self._name else target
+        return self._target
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
@@ -0,0 +1,34 @@
+import re
+
+# vacancy_text из settings.json — шаблон письма: {title}, {employer} и {city}
+# заменяются данными вакансии. Остальные фигурные скобки остаются как есть,
+# поэтому старые письма без плейсхолдеров работают без изменений
+PLACEHOLDERS = ("title", "employer", "city")
+_PLACEHOLDER_RE = re.compile(r"\{(" + "|".join(PLACEHOLDERS) + r")\}")
+
+# React следит за value через собственный setter прототипа, поэтому значение
+# ставится через него, а input/change сообщают форме, что поле изменилось
+FILL_TEXTAREA_JS = """
+const textarea = document.querySelector(arguments[0]);
+if (!textarea) return null;
+const setter = Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, "value").set;
+setter.call(textarea, arguments[1]);
+textarea.dispatchEvent(new Event("input", {bubbles: true}));
+textarea.dispatchEvent(new Event("change", {bubbles: true}));
+return textarea.value;
+"""
+
+
+class LetterTemplate:
+    # шаблон разбирается один раз за запуск: [текст, поле, текст, поле, ..., текст]
+    def __init__(self, text: str):
+        self.text = text or ""
+        self.parts = _PLACEHOLDER_RE.split(self.text)
+
+    def __bool__(self):
+        return bool(self.text)
+
+    def render(self, vacancy: dict) -> str:
+        if len(self.parts) == 1:
+            return self.text
+        return "".join(part if i % 2 == 0 else (vacancy.get(part) or "") for i, part in enumerate(self.parts))
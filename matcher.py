@@ -0,0 +1,80 @@
+import re
+
+REGEX_PREFIX = "re:"
+WORD_PREFIX = "word:"
+# поля склеиваются через перевод строки, а MULTILINE делает ^ и $ границами поля
+SEPARATOR = "\n"
+FLAGS = re.IGNORECASE | re.MULTILINE
+
+
+def trie_pattern(words) -> str:
+    # "java|javascript|jun" -> "j(?:ava(?:script)?|un)": модуль re не умеет сам
+    # объединять общие префиксы, и без этого сотни альтернатив перебираются в каждой позиции
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        if "" in node and len(node) == 1:
+            return ""
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def compile_rules(rules: list[str]) -> list[str]:
+    # обычные слова и word: сливаются в одно выражение, а каждое re: остаётся отдельным:
+    # в общей альтернации ломаются (?i) в начале правила, одноимённые группы и \1
+    literals, words, expressions = set(), set(), []
+    for rule in rules:
+        if rule.startswith(REGEX_PREFIX):
+            expressions.append(rule[len(REGEX_PREFIX):])
+        elif rule.startswith(WORD_PREFIX):
+            words.add(rule[len(WORD_PREFIX):].strip().casefold())
+        else:
+            literals.add(rule.casefold())
+    parts = []
+    if literals:
+        parts.append(trie_pattern(literals))
+    if words - {""}:
+        parts.append(rf"(?<!\w){trie_pattern(words - {''})}(?!\w)")
+    return (["|".join(parts)] if parts else []) + expressions
+
+
+class StopWords:
+    # стоп-слова компилируются один раз на запуск.
+    # Обычное слово ищется подстрокой, как раньше; "word:java" — только целым словом;
+    # "re:^junior\b" — произвольное регулярное выражение
+    def __init__(self, rules: list[str]):
+        self.rules = [rule.strip() for rule in rules if rule.strip()]
+        self.patterns = [re.compile(pattern, FLAGS) for pattern in compile_rules(self.rules)]
+
+    def search(self, text: str, start: int = 0, end: int = None) -> bool:
+        end = len(text) if end is None else end
+        return any(pattern.search(text, start, end) for pattern in self.patterns)
+
+    def matches(self, *texts: str) -> bool:
+        return any(self.search(text.casefold()) for text in texts if text)
+
+    def excluded_indexes(self, items: list[tuple[str, str]]) -> set[int]:
+        # страница приводится к нижнему регистру одной строкой, а поиск идёт
+        # в границах каждого поля: выражение не должно цеплять соседнее поле или карточку
+        if not self.patterns or not items:
+            return set()
+        # casefold может менять длину строки ("ß" -> "ss"), поэтому границы считаются по уже свёрнутым полям
+        folded = [[field.casefold() for field in fields if field] for fields in items]
+        spans = []
+        position = 0
+        for fields in folded:
+            card_spans = []
+            for field in fields:
+                card_spans.append((position, position + len(field)))
+                position += len(field) + len(SEPARATOR)
+            spans.append(card_spans)
+        text = SEPARATOR.join(field for fields in folded for field in fields)
+        return {index for index, card_spans in enumerate(spans) if any(self.search(text, start, end) for start, end in card_spans)}
@@ -0,0 +1,127 @@
+import json
+import math
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Замеры фаз запуска: with metrics.span("page_load"): ...
+# Пока метрики не включены, span() возвращает общий пустой контекст,
+# так что в горячем цикле это одна проверка флага
+
+_NULL_SPAN = nullcontext()
+QUANTILES = (0.5, 0.95)
+
+
+def quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+class _Span:
+    __slots__ = ("metrics", "name", "labels", "started")
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.record(self.name, time.perf_counter() - self.started, error=exc_type is not None, **self.labels)
+        return False
+
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.labels = {}
+        self.durations = {}
+        self.lock = threading.Lock()
+        self.jsonl = None
+        self.prometheus_path = None
+        self.server = None
+
+    def configure(self, jsonl_path: str = None, prometheus_path: str = None, port: int = None, **labels):
+        self.enabled = True
+        self.labels = labels
+        self.prometheus_path = prometheus_path
+        if jsonl_path:
+            self.jsonl = open(jsonl_path, "a", encoding="utf-8", buffering=64 * 1024)
+        if port:
+            self.serve(port)
+
+    def span(self, name: str, **labels):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, labels)
+
+    def record(self, name: str, seconds: float, **labels):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.durations.setdefault(name, []).append(seconds)
+            if self.jsonl:
+                self.jsonl.write(json.dumps({"ts": round(time.time(), 3), "span": name, "seconds": round(seconds, 6), **self.labels, **labels}, ensure_ascii=False) + "\n")
+
+    def prometheus(self) -> str:
+        labels = "".join(f',{key}="{value}"' for key, value in self.labels.items())
+        lines = ["# HELP hh_span_seconds Длительность фаз бота", "# TYPE hh_span_seconds summary"]
+        with self.lock:
+            durations = {name: list(values) for name, values in self.durations.items()}
+        for name, values in sorted(durations.items()):
+            for q in QUANTILES:
+                lines.append(f'hh_span_seconds{{span="{name}"{labels},quantile="{q}"}} {quantile(values, q):.6f}')
+            lines.append(f'hh_span_seconds_sum{{span="{name}"{labels}}} {sum(values):.6f}')
+            lines.append(f'hh_span_seconds_count{{span="{name}"{labels}}} {len(values)}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        # только локально: метрики раскрывают имя аккаунта и ход его работы
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                body = metrics.prometheus().encode("utf-8")
+                self.send_response(200 if self.path == "/metrics" else 404)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"📡 Метрики Prometheus: http://{host}:{port}/metrics")
+
+    def print_summary(self):
+        if not self.enabled or not self.durations:
+            return
+        print("\n⏱️ Время по фазам (p50 / p95 / всего, количество):")
+        with self.lock:
+            durations = {name: list(values) for name, values in self.durations.items()}
+        for name, values in sorted(durations.items(), key=lambda item: -sum(item[1])):
+            print(f"   {name:<24} {quantile(values, 0.5):8.3f} с {quantile(values, 0.95):8.3f} с {sum(values):9.1f} с  ×{len(values)}")
+
+    def close(self):
+        if not self.enabled:
+            return
+        if self.jsonl:
+            self.jsonl.close()
+            self.jsonl = None
+        if self.prometheus_path:
+            with open(self.prometheus_path, "w", encoding="utf-8") as f:
+                f.write(self.prometheus())
+        if self.server:
+            self.server.shutdown()
+            self.server = None
+
+
+metrics = Metrics()
@@ -0,0 +1,106 @@
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Параллельный запуск нескольких аккаунтов: каждый аккаунт — отдельный процесс
+# со своим Chrome, профилем и cookies. Число одновременных браузеров ограничено
+# ядрами, свободной памятью и --max-browsers
+
+BROWSER_MEMORY_MB = 600
+
+
+def available_memory_mb():
+    try:
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def browser_limit(requested: int = None, accounts: int = 1, browser_memory_mb: int = BROWSER_MEMORY_MB) -> int:
+    limit = min(accounts, available_cores())
+    memory = available_memory_mb()
+    if memory is not None:
+        limit = min(limit, max(1, memory // browser_memory_mb))
+    if requested:
+        limit = min(limit, requested)
+    return max(1, limit)
+
+
+class PrefixedStream:
+    # добавляет "[аккаунт]" в начало каждой строки вывода воркера
+    def __init__(self, stream, prefix: str):
+        self.stream = stream
+        self.prefix = prefix
+        self.line_start = True
+        self.lock = threading.Lock()
+
+    def write(self, text: str):
+        with self.lock:
+            out = []
+            for line in text.splitlines(keepends=True):
+                if self.line_start and line.strip():
+                    out.append(self.prefix)
+                out.append(line)
+                self.line_start = line.endswith("\n")
+            self.stream.write("".join(out))
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def isatty(self):
+        return False
+
+
+def _run_worker(worker, account_id: str, account_name: str, args):
+    sys.stdout = PrefixedStream(sys.__stdout__, f"[{account_name}] ")
+    sys.stderr = PrefixedStream(sys.__stderr__, f"[{account_name}] ")
+    try:
+        return worker(account_id, args, interactive=False)
+    except Exception as e:
+        print(f"⚠️ Аккаунт завершился с ошибкой: {e}")
+        return {"account": account_name, "found": 0, "applied": 0, "redirected": 0, "error": str(e)}
+    finally:
+        sys.stdout.flush()
+
+
+def run_accounts(worker, accounts: list[tuple[str, str]], args, max_browsers: int = None) -> list[dict]:
+    workers = browser_limit(max_browsers, len(accounts))
+    print(f"🚀 Запускаем {len(accounts)} аккаунтов, одновременно браузеров: {workers}")
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_worker, worker, account_id, name, args): name for account_id, name in accounts}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = {"account": name, "found": 0, "applied": 0, "redirected": 0, "error": str(e)}
+    summary = [results[name] for _, name in accounts]
+    print_summary(summary)
+    return summary
+
+
+def print_summary(summary: list[dict]):
+    print("\n📊 Итог по аккаунтам:")
+    for row in summary:
+        line = f"👤 {row['account']}: найдено {row['found']}, откликов {row['applied']}, редиректов {row['redirected']}"
+        if row.get("error"):
+            line += f" — ошибка: {row['error']}"
+        print(line)
+    print(f"Σ найдено {sum(r['found'] for r in summary)}, откликов {sum(r['applied'] for r in summary)}, редиректов {sum(r['redirected'] for r in summary)}")
@@ -0,0 +1,83 @@
+import random
+import threading
+import time
+from metrics import metrics
+
+# интервалы (секунды) между однотипными действиями: page — страницы выдачи,
+# url — поисковые ссылки, vacancy — отклики
+PROFILES = {
+    "aggressive": {"page": (0.3, 0.8), "url": (0.5, 1.5), "vacancy": (0.5, 1.0)},
+    "normal": {"page": (1.5, 3.0), "url": (2.0, 4.0), "vacancy": (3.0, 5.0)},
+    "cautious": {"page": (3.0, 6.0), "url": (5.0, 10.0), "vacancy": (6.0, 12.0)},
+}
+DEFAULT_PROFILE = "normal"
+
+
+class Pacer:
+    # «человеческие» паузы собраны в одном месте. Интервал отсчитывается от
+    # предыдущего действия того же типа, поэтому время загрузки страницы или
+    # отклика уже входит в паузу, а не прибавляется к ней
+    def __init__(self, profile=DEFAULT_PROFILE, min_delay: float = 0.0):
+        self.name, self.intervals = self.resolve(profile)
+        self.min_delay = profile.get("min_delay", min_delay) if isinstance(profile, dict) else min_delay
+        self.last = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def resolve(profile):
+        if isinstance(profile, dict):
+            base = profile.get("profile", DEFAULT_PROFILE)
+            intervals = dict(PROFILES[base])
+            intervals.update({kind: tuple(value) for kind, value in profile.items() if kind in intervals})
+            return f"{base}*", intervals
+        if profile not in PROFILES:
+            raise ValueError(f"Неизвестный профиль пауз: {profile}. Доступны: {', '.join(PROFILES)}")
+        return profile, dict(PROFILES[profile])
+
+    def delay(self, kind: str) -> float:
+        low, high = self.intervals[kind]
+        target = max(random.uniform(low, high), self.min_delay)
+        with self.lock:
+            last = self.last.get(kind)
+        if last is None:
+            return 0.0
+        return max(0.0, target - (time.monotonic() - last))
+
+    def pause(self, kind: str):
+        seconds = self.delay(kind)
+        if seconds > 0:
+            time.sleep(seconds)
+            metrics.record("sleep", seconds, kind=kind)
+        with self.lock:
+            self.last[kind] = time.monotonic()
+        return seconds
+
+    def mean(self, kind: str) -> float:
+        low, high = self.intervals[kind]
+        return max((low + high) / 2, self.min_delay)
+
+    def rate(self, kind: str):
+        # действий в секунду при средней паузе; None — профиль без пауз
+        mean = self.mean(kind)
+        return 1 / mean if mean else None
+
+
+class RateLimiter:
+    # общий на аккаунт темп запросов: не чаще rate в секунду, сколько бы потоков ни ждало.
+    # Каждый вызов бронирует следующий свободный слот, поэтому запросы не сбиваются в пачки
+    def __init__(self, rate: float = None):
+        # rate=None — без ограничения, потоки только не мешают друг другу
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_at = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self) -> float:
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_at)
+            self.next_at = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+            metrics.record("sleep", delay, kind="rate")
+        return delay
@@ -0,0 +1,56 @@
+import queue
+import threading
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def buffered(iterable, size: int = 20):
+    # парсер работает в отдельном потоке и складывает вакансии в очередь;
+    # put блокируется, пока откликер не разберёт очередь — это и есть backpressure
+    items = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_Failure(e))
+            return
+        put(_DONE)
+
+    producer = threading.Thread(target=produce, name="scraper", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+
+
+def stream(scraper, size: int = 20):
+    # в браузерном режиме парсер и откликер делят один Chrome, поэтому
+    # страницы выдачи читаются лениво в том же потоке, по одной за раз
+    if scraper.scrape_mode == "http":
+        return buffered(scraper.iter_vacancies(), size)
+    return scraper.iter_vacancies()
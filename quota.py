@@ -0,0 +1,54 @@
+import math
+import time
+from collections import deque
+
+DAY = 24 * 60 * 60
+DAILY_LIMIT = 200
+# hh.ru сообщил о лимите, а своих откликов в окне не видно (отправлены с другого устройства)
+LIMIT_BACKOFF = 60 * 60
+
+
+class ResponseQuota:
+    # скользящее окно hh.ru: не больше limit откликов за последние 24 часа.
+    # Время откликов берётся из индекса вакансий, поэтому учитываются и обычные запуски
+    def __init__(self, limit: int = DAILY_LIMIT, window: float = DAY):
+        self.limit = limit
+        self.window = window
+        self.sent = deque()
+        self.blocked_until = 0.0
+
+    def sync(self, timestamps):
+        self.sent = deque(sorted(timestamps))
+        self._expire(time.time())
+
+    def _expire(self, now: float):
+        while self.sent and self.sent[0] <= now - self.window:
+            self.sent.popleft()
+
+    def remaining(self) -> int:
+        now = time.time()
+        self._expire(now)
+        if now < self.blocked_until:
+            return 0
+        return max(0, self.limit - len(self.sent))
+
+    def next_free_at(self) -> float:
+        # момент, когда освободится хотя бы один отклик
+        now = time.time()
+        self._expire(now)
+        if now < self.blocked_until:
+            return self.blocked_until
+        if len(self.sent) < self.limit:
+            return now
+        return self.sent[len(self.sent) - self.limit] + self.window
+
+    def exhausted(self):
+        now = time.time()
+        self._expire(now)
+        self.blocked_until = self.sent[0] + self.window if self.sent else now + LIMIT_BACKOFF
+
+    def cycle_budget(self, interval: float) -> int:
+        # равная доля суточной квоты на цикл: отклики распределяются по всем суткам,
+        # а не уходят целиком в первые полчаса
+        share = math.ceil(self.limit * interval / self.window)
+        return min(self.remaining(), share)
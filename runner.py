@@ -0,0 +1,89 @@
+import os
+from lazy import LazyImport
+from accounts import get_runs_dir
+from bot import HHScraper, HHResponder
+from driver import BrowserSession
+from journal import open_run
+from metrics import metrics
+from pacing import Pacer
+from pipeline import stream
+
+Options = LazyImport("selenium.webdriver.chrome.options", "Options")
+
+# Сборка и запуск одного прохода по аккаунту: общая для обычного запуска (main.py) и --daemon
+
+
+def chrome_options_from_args(args):
+    if not args.headless:
+        return None
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    return chrome_options
+
+
+def make_session(args, interactive=True):
+    chrome_options = chrome_options_from_args(args)
+    return BrowserSession(
+        chrome_options, block_resources=args.block_resources, page_load_strategy=args.page_load_strategy, interactive=interactive,
+        recycle_rss_mb=args.recycle_rss_mb, recycle_pages=args.recycle_pages, recycle_error_rate=args.recycle_error_rate,
+    )
+
+
+def make_scraper(account_id, args, session, pacer=None, interactive=True, account_name=None):
+    scraper = HHScraper(max_pages=args.max_pages, account_id=account_id, options=session.options, scrape_mode=args.scrape_mode, session=session, pacer=pacer, incremental=args.incremental, preclassify=args.preclassify, concurrency=args.scrape_concurrency, request_rate=args.request_rate, account_name=account_name)
+    if not interactive:
+        session.profile_dir = os.path.join(scraper.account_path, "chrome-profile")
+    if args.metrics and not metrics.enabled:
+        metrics.configure(
+            jsonl_path=os.path.join(scraper.account_path, "metrics.jsonl"),
+            prometheus_path=os.path.join(scraper.account_path, "metrics.prom"),
+            port=args.metrics_port,
+            account=scraper.account_name,
+        )
+    return scraper
+
+
+def run_cycle(scraper, session, args, resume=False, max_applied=None, stop_event=None):
+    # один проход: парсинг всех URL и отклики по мере нахождения вакансий
+    journal, scraper.checkpoint = open_run(get_runs_dir(scraper.account_name), resume=resume)
+    scraper.journal = journal
+    journal.append({"type": "start", "account": scraper.account_name, "urls": scraper.urls, "max_pages": args.max_pages}, sync=True)
+    try:
+        scraper.ensure_login()
+        vacancies = stream(scraper, args.queue_size)
+        responder = HHResponder(vacancies=vacancies, options=scraper.options, cookie_path=scraper.cookie_path, account_name=scraper.account_name, session=session, index=scraper.index, pacer=scraper.pacer, journal=journal, max_applied=max_applied, stop_event=stop_event, respond_mode=args.respond_mode, classifier=scraper.classifier)
+        responder.respond_to_all()
+        if not responder.limit_reached and not responder.interrupted:
+            journal.append({"type": "finish"}, sync=True)
+        if scraper.all_vacancies:
+            print(f"\n📊 Найдено {len(scraper.all_vacancies)} вакансий.")
+        else:
+            print("❌ Вакансии не найдены или все исключены.")
+    finally:
+        journal.close()
+    return responder
+
+
+def run_account(account_id, args, interactive=True):
+    session = make_session(args, interactive)
+    pacer = Pacer(args.pacing) if args.pacing else None
+    scraper = make_scraper(account_id, args, session, pacer, interactive)
+
+    responder = None
+    try:
+        responder = run_cycle(scraper, session, args, resume=args.resume)
+    finally:
+        session.quit()
+        scraper.close()
+        metrics.print_summary()
+        metrics.close()
+
+    return {
+        "account": scraper.account_name,
+        "found": len(scraper.all_vacancies),
+        "applied": len(responder.applied_responses) if responder else 0,
+        "redirected": len(responder.redirected_responses) if responder else 0,
+    }
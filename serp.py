@@ -0,0 +1,146 @@
+import re
+from urllib.parse import urlparse, parse_qs, urljoin
+from lxml import etree, html as lxml_html
+
+VACANCY_CARD_XPATH = "//div[@data-qa='vacancy-serp__vacancy']"
+VACANCY_TITLE_XPATH = ".//span[@data-qa='serp-item__title-text']"
+VACANCY_LINK_XPATH = ".//a[@data-qa='serp-item__title']"
+VACANCY_EMPLOYER_XPATH = ".//span[@data-qa='vacancy-serp__vacancy-employer-text']"
+VACANCY_ADDRESS_XPATH = ".//*[@data-qa='vacancy-serp__vacancy-address']"
+VIEWED_CARD_CLASS = "workflow-status-container--cGFP1E5X940FGAbg"
+SERP_TOTAL_XPATH = "//*[@data-qa='vacancies-search-header']"
+
+# один execute_script на всю страницу вместо 4-5 запросов к WebDriver на карточку
+SERP_CARDS_JS = """
+const viewedClass = arguments[0];
+const cards = document.querySelectorAll("div[data-qa='vacancy-serp__vacancy']");
+return Array.from(cards, (card) => {
+    const title = card.querySelector("span[data-qa='serp-item__title-text']");
+    const link = card.querySelector("a[data-qa='serp-item__title']");
+    const employer = card.querySelector("span[data-qa='vacancy-serp__vacancy-employer-text']");
+    const address = card.querySelector("[data-qa='vacancy-serp__vacancy-address']");
+    return {
+        title: title ? title.innerText : null,
+        employer: employer ? employer.innerText : null,
+        address: address ? address.innerText : null,
+        link: link ? link.href : null,
+        viewed: card.getElementsByClassName(viewedClass).length > 0,
+    };
+});
+"""
+
+# «Найдено 1 234 вакансии»: разряды разделены обычными или неразрывными пробелами
+SERP_TOTAL_JS = """
+const header = document.querySelector("[data-qa='vacancies-search-header']");
+return header ? header.innerText : null;
+"""
+
+_VACANCY_PATH_RE = re.compile(r"/vacancy/(\d+)")
+_TOTAL_RE = re.compile(r"\d[\d\s\u00a0\u202f]*")
+
+
+def vacancy_id(link):
+    if not link:
+        return None
+    match = _VACANCY_PATH_RE.search(link)
+    if match:
+        return match.group(1)
+    ids = parse_qs(urlparse(link).query).get("vacancyId")
+    return ids[0] if ids else None
+
+
+def clean_text(text):
+    if text is None:
+        return None
+    return " ".join(text.split())
+
+
+def parse_total(text):
+    match = _TOTAL_RE.search(text or "")
+    if not match:
+        return None
+    return int(re.sub(r"\D", "", match.group(0)))
+
+
+def city(address):
+    # «Москва, Арбатская» → «Москва»: в письме нужен город, а не станция метро
+    address = clean_text(address)
+    if not address:
+        return None
+    return address.split(",", 1)[0].strip() or None
+
+
+def normalize_card(raw):
+    link = raw.get("link")
+    return {
+        "title": clean_text(raw.get("title")),
+        "employer": clean_text(raw.get("employer")),
+        "city": city(raw.get("address")),
+        "link": link,
+        "id": vacancy_id(link),
+        "viewed": bool(raw.get("viewed")),
+    }
+
+
+_cards_xpath = etree.XPath(VACANCY_CARD_XPATH)
+_title_xpath = etree.XPath(VACANCY_TITLE_XPATH)
+_link_xpath = etree.XPath(VACANCY_LINK_XPATH)
+_employer_xpath = etree.XPath(VACANCY_EMPLOYER_XPATH)
+_address_xpath = etree.XPath(VACANCY_ADDRESS_XPATH)
+_total_xpath = etree.XPath(SERP_TOTAL_XPATH)
+_viewed_xpath = etree.XPath(f".//*[contains(concat(' ', normalize-space(@class), ' '), ' {VIEWED_CARD_CLASS} ')]")
+
+
+# поведение innerText, которое видит SERP_CARDS_JS, в отличие от text_content():
+# <br> и блочные элементы дают перевод строки, script/style в текст не попадают
+_SKIP_TAGS = {"script", "style", "template"}
+_BLOCK_TAGS = {"div", "p", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "header", "footer", "table", "tr"}
+
+
+def inner_text(element):
+    parts = []
+
+    def walk(node):
+        if not isinstance(node.tag, str) or node.tag in _SKIP_TAGS:
+            return
+        block = node.tag in _BLOCK_TAGS
+        if node.tag == "br" or block:
+            parts.append("\n")
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if block:
+            parts.append("\n")
+
+    walk(element)
+    return "".join(parts)
+
+
+def _first_text(card, xpath):
+    found = xpath(card)
+    return inner_text(found[0]) if found else None
+
+
+def parse_serp(page_html, page_url):
+    # те же селекторы и та же нормализация, что и в SERP_CARDS_JS,
+    # чтобы HTTP и Selenium режимы отдавали одинаковые словари.
+    # Возвращает (карточки, общее число найденных вакансий или None)
+    if not page_html.strip():
+        return [], None
+    tree = lxml_html.fromstring(page_html)
+    cards = []
+    for card in _cards_xpath(tree):
+        links = _link_xpath(card)
+        href = links[0].get("href") if links else None
+        cards.append(normalize_card({
+            "title": _first_text(card, _title_xpath),
+            "employer": _first_text(card, _employer_xpath),
+            "address": _first_text(card, _address_xpath),
+            "link": urljoin(page_url, href) if href is not None else None,
+            "viewed": bool(_viewed_xpath(card)),
+        }))
+    headers = _total_xpath(tree)
+    return cards, parse_total(inner_text(headers[0])) if headers else None
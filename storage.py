@@ -0,0 +1,116 @@
+import sqlite3
+import threading
+import time
+
+SEEN = "seen"
+APPLIED = "applied"
+REDIRECTED = "redirected"
+EXCLUDED = "excluded"
+ERRORED = "errored"
+# отклик уже был отправлен раньше и не этим ботом — в суточную квоту не входит
+RESPONDED = "responded"
+
+# по этим вакансиям повторно ходить не нужно; excluded пересчитывается по текущим
+# стоп-словам, а seen/errored ещё ждут отклика
+HANDLED = {APPLIED, REDIRECTED, RESPONDED}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vacancies (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    title TEXT,
+    employer TEXT,
+    link TEXT,
+    first_seen REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS vacancies_status ON vacancies (status, updated_at);
+CREATE TABLE IF NOT EXISTS watermarks (
+    url TEXT PRIMARY KEY,
+    vacancy_id INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+UPSERT = """
+INSERT INTO vacancies (id, status, title, employer, link, first_seen, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    status = excluded.status,
+    title = excluded.title,
+    employer = excluded.employer,
+    link = excluded.link,
+    updated_at = excluded.updated_at
+"""
+
+
+class VacancyIndex:
+    def __init__(self, path: str, batch_size: int = 50):
+        self.path = path
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.pending = []
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # статусы целиком держим в памяти: проверка в горячем цикле — обычный dict lookup
+        self.statuses = dict(self.conn.execute("SELECT id, status FROM vacancies"))
+
+    def status(self, vacancy_id):
+        return self.statuses.get(vacancy_id)
+
+    def is_handled(self, vacancy_id) -> bool:
+        return self.statuses.get(vacancy_id) in HANDLED
+
+    def mark(self, vacancy: dict, status: str):
+        vacancy_id = vacancy.get("id")
+        if not vacancy_id:
+            return
+        now = time.time()
+        with self.lock:
+            # обработанная вакансия назад в seen/excluded/errored не возвращается:
+            # иначе теряется история и занижается суточная квота
+            if self.statuses.get(vacancy_id) in HANDLED and status not in HANDLED:
+                return
+            self.statuses[vacancy_id] = status
+            self.pending.append((vacancy_id, status, vacancy.get("title"), vacancy.get("employer"), vacancy.get("link"), now, now))
+            if len(self.pending) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if not self.pending:
+            return
+        with self.conn:
+            self.conn.executemany(UPSERT, self.pending)
+        self.pending = []
+
+    def applied_since(self, since: float) -> list[float]:
+        # время отправленных откликов — для учёта суточного лимита hh.ru
+        with self.lock:
+            self._flush()
+            rows = self.conn.execute("SELECT updated_at FROM vacancies WHERE status = ? AND updated_at >= ?", (APPLIED, since)).fetchall()
+        return [row[0] for row in rows]
+
+    # high-water mark для инкрементального парсинга: самый новый номер вакансии,
+    # который уже встречался в выдаче этого URL
+    def watermark(self, url: str):
+        with self.lock:
+            row = self.conn.execute("SELECT vacancy_id FROM watermarks WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, url: str, vacancy_id: int):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO watermarks (url, vacancy_id, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET vacancy_id = MAX(vacancy_id, excluded.vacancy_id), updated_at = excluded.updated_at",
+                (url, vacancy_id, time.time()),
+            )
+
+    def close(self):
+        self.flush()
+        self.conn.close()
@@ -0,0 +1,18 @@
+import os
+import sys
+
+# модули бота лежат в корне репозитория, а не в пакете
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from bench.stand import Stand, serve, base_url
+
+
+@pytest.fixture
+def stand():
+    # локальная копия hh.ru на свободном порту; base_url — в stand.url
+    instance = Stand(pages=2, latency=0)
+    server = serve(instance)
+    instance.url = base_url(server)
+    yield instance
+    server.shutdown()
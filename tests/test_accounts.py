@@ -0,0 +1,26 @@
+import pytest
+from accounts import AccountSettings
+
+
+def test_valid_settings():
+    settings = AccountSettings.from_dict({
+        "urls": ["https://hh.ru/search/vacancy?text=python"],
+        "excluded_words": ["java", "word:go", "re:(?i)junior", "re:(?P<w>dev)ops", "re:(?P<w>qa)"],
+        "pacing": {"profile": "cautious", "page": [1, 2]},
+    })
+    assert settings.pacing == {"profile": "cautious", "page": [1, 2]}
+    assert settings.vacancy_text == ""
+
+
+@pytest.mark.parametrize("data, message", [
+    ({"urls": "https://hh.ru"}, "urls"),
+    ({"pacing": "fast"}, "профиль пауз 'fast'"),
+    ({"pacing": {"profile": "fast"}}, "профиль пауз 'fast'"),
+    ({"excluded_words": ["re:(abc"]}, "re:(abc"),
+    ({"excluded_words": ["java", "re:x(?i)y"]}, "re:x(?i)y"),
+])
+def test_invalid_settings_name_the_file(data, message):
+    with pytest.raises(ValueError) as error:
+        AccountSettings.from_dict(data, "acc/settings.json")
+    assert "acc/settings.json" in str(error.value)
+    assert message in str(error.value)
@@ -0,0 +1,105 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import accounts
+import http_client
+from bench.run import NO_PACING
+from bench.stand import make_account
+from bot import HHResponder
+from http_client import cookies_session, submit_response, LIMIT_ERROR
+from pacing import Pacer
+from storage import VacancyIndex, APPLIED, SEEN
+
+
+@pytest.fixture
+def account(stand, tmp_path, monkeypatch):
+    monkeypatch.setattr(accounts, "ACCOUNTS_DIR", str(tmp_path))
+    monkeypatch.setattr(http_client, "HH_URL", stand.url)
+    return make_account(str(tmp_path), stand.url, vacancy_text="Здравствуйте! {title}")
+
+
+@pytest.fixture
+def responder(account, tmp_path):
+    index = VacancyIndex(str(tmp_path / "vacancies.sqlite3"))
+    yield HHResponder(None, [], os.path.join(account, "cookies.json"), os.path.basename(account), index=index, pacer=Pacer(NO_PACING), respond_mode="http")
+    index.close()
+
+
+def vacancy_of_kind(stand, kind):
+    for index in range(stand.total):
+        vacancy = stand.vacancy(index)
+        if vacancy["kind"] == kind:
+            return {**vacancy, "link": f"{stand.url}/vacancy/{vacancy['id']}"}
+    raise LookupError(kind)
+
+
+def test_submit_response_success(stand, account):
+    # стенд, как и hh.ru, принимает POST только с X-Xsrftoken, равным cookie _xsrf
+    status, body = submit_response(cookies_session(os.path.join(account, "cookies.json")), "100000", "letter")
+    assert status == 200 and body.get("success")
+    assert stand.responses == [{"id": "100000", "letter": "letter"}]
+
+
+def test_respond_http_applied(stand, responder):
+    vacancy = vacancy_of_kind(stand, "popup")
+    assert responder.respond_http(vacancy, 1) == "applied"
+    assert responder.index.status(vacancy["id"]) == APPLIED
+    assert stand.responses[-1]["letter"] == f"Здравствуйте! {vacancy['title']}"
+
+
+def test_respond_http_limit(stand, responder):
+    stand.response_limit = 0
+    vacancy = vacancy_of_kind(stand, "popup")
+    assert responder.respond_http(vacancy, 1) == "limit"
+    assert responder.index.status(vacancy["id"]) is None
+
+
+@pytest.mark.parametrize("kind", ["external", "questionnaire"])
+def test_respond_http_falls_back_on_rejection(stand, responder, kind):
+    vacancy = vacancy_of_kind(stand, kind)
+    assert responder.respond_http(vacancy, 1) is None
+    assert responder.applied_responses == []
+
+
+def test_respond_http_falls_back_without_session(stand, responder):
+    responder.http.cookies.clear()
+    vacancy = vacancy_of_kind(stand, "popup")
+    responder.index.mark(vacancy, SEEN)
+    assert responder.respond_http(vacancy, 1) is None
+    assert responder.index.status(vacancy["id"]) == SEEN
+
+
+def test_respond_http_falls_back_on_login_redirect(stand, responder, monkeypatch):
+    # протухшая сессия: hh.ru отвечает на POST редиректом на страницу входа с кодом 200
+    class LoginRedirect(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            self.send_response(302)
+            self.send_header("Location", "/account/login")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_GET(self):
+            body = b"<html>login</html>"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LoginRedirect)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(http_client, "HH_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    try:
+        assert responder.respond_http(vacancy_of_kind(stand, "popup"), 1) is None
+        assert responder.applied_responses == []
+    finally:
+        server.shutdown()
+
+
+def test_limit_error_constant_matches_stand(stand, account):
+    stand.response_limit = 0
+    _, body = submit_response(cookies_session(os.path.join(account, "cookies.json")), "100000", "letter")
+    assert body["error"] == LIMIT_ERROR
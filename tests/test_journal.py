@@ -0,0 +1,64 @@
+import os
+from journal import Checkpoint, Journal, open_run, read_journal, KEEP_RUNS
+
+URL = "https://hh.ru/search/vacancy?text=python"
+OTHER_URL = "https://hh.ru/search/vacancy?text=go"
+
+
+def vacancy(vacancy_id):
+    return {"id": vacancy_id, "title": f"Вакансия {vacancy_id}", "employer": "ООО", "link": f"https://hh.ru/vacancy/{vacancy_id}"}
+
+
+def test_checkpoint_pending_and_pages():
+    checkpoint = Checkpoint([
+        {"type": "start"},
+        {"type": "page", "url": URL, "page": 0, "vacancies": [vacancy("1"), vacancy("2")]},
+        {"type": "response", "id": "1", "status": "applied"},
+        {"type": "page", "url": URL, "page": 1, "vacancies": [vacancy("3")]},
+        {"type": "url_done", "url": URL},
+        {"type": "page", "url": OTHER_URL, "page": 0, "vacancies": [vacancy("4")]},
+    ])
+    assert [item["id"] for item in checkpoint.pending] == ["2", "3", "4"]
+    assert checkpoint.done_urls == {URL}
+    assert checkpoint.next_page(OTHER_URL) == 1
+    assert checkpoint.next_page("https://hh.ru/new") == 0
+    assert not checkpoint.finished
+
+
+def test_read_journal_stops_at_truncated_line(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    journal = Journal(path)
+    journal.append({"type": "start"})
+    journal.append({"type": "response", "id": "1", "status": "applied"}, sync=True)
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "page", "url"')
+    assert [record["type"] for record in read_journal(path)] == ["start", "response"]
+
+
+def test_resume_continues_unfinished_run(tmp_path):
+    runs_dir = str(tmp_path / "runs")
+    journal, checkpoint = open_run(runs_dir)
+    assert checkpoint is None
+    journal.append({"type": "page", "url": URL, "page": 0, "vacancies": [vacancy("1")]})
+    journal.close()
+
+    journal, checkpoint = open_run(runs_dir, resume=True)
+    assert [item["id"] for item in checkpoint.pending] == ["1"]
+    journal.append({"type": "finish"}, sync=True)
+    journal.close()
+
+    # завершённый запуск не продолжается
+    journal, checkpoint = open_run(runs_dir, resume=True)
+    journal.close()
+    assert checkpoint is None
+
+
+def test_old_runs_are_pruned(tmp_path):
+    runs_dir = str(tmp_path / "runs")
+    os.makedirs(runs_dir)
+    for i in range(KEEP_RUNS + 3):
+        open(os.path.join(runs_dir, f"{i:04d}.jsonl"), "w").close()
+    journal, _ = open_run(runs_dir)
+    journal.close()
+    assert len(os.listdir(runs_dir)) == KEEP_RUNS
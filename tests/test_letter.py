@@ -0,0 +1,28 @@
+from letter import LetterTemplate
+
+VACANCY = {"title": "Python разработчик", "employer": "ООО Ромашка", "city": "Казань"}
+
+
+def test_placeholders_are_filled():
+    letter = LetterTemplate("Здравствуйте, {employer}! Откликаюсь на «{title}» ({city}).")
+    assert letter.render(VACANCY) == "Здравствуйте, ООО Ромашка! Откликаюсь на «Python разработчик» (Казань)."
+
+
+def test_other_braces_are_kept():
+    letter = LetterTemplate("Код: {\"a\": 1} {unknown} {title}")
+    assert letter.render(VACANCY) == "Код: {\"a\": 1} {unknown} Python разработчик"
+
+
+def test_missing_field_renders_empty():
+    assert LetterTemplate("{title} в {city}").render({"title": "QA", "city": None}) == "QA в "
+
+
+def test_plain_letter_is_unchanged():
+    letter = LetterTemplate("Просто письмо")
+    assert letter.render(VACANCY) == "Просто письмо"
+    assert letter
+
+
+def test_empty_letter_is_falsy():
+    assert not LetterTemplate("")
+    assert not LetterTemplate(None)
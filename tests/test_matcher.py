@@ -0,0 +1,52 @@
+import pytest
+from matcher import StopWords
+
+
+@pytest.mark.parametrize("rules, text, expected", [
+    (["java"], "Senior JavaScript", True),
+    (["word:java"], "Senior JavaScript", False),
+    (["word:java"], "Java / Kotlin", True),
+    (["re:^junior\\b"], "Junior Python", True),
+    (["re:^junior\\b"], "Python Junior", False),
+    (["strasse"], "Straße", True),
+])
+def test_matches(rules, text, expected):
+    assert StopWords(rules).matches(text) is expected
+
+
+def test_inline_flags_in_regex_rule():
+    # в общей альтернации (?i) не в начале выражения — re.error при сборке
+    assert StopWords(["java", "re:(?i)junior"]).matches("Junior dev")
+
+
+def test_regex_rules_may_reuse_group_names():
+    stop_words = StopWords(["re:(?P<w>dev)ops", "re:(?P<w>qa)"])
+    assert stop_words.matches("DevOps")
+    assert stop_words.matches("QA engineer")
+
+
+def test_backreferences_stay_inside_their_rule():
+    stop_words = StopWords(["re:(a)\\1", "re:(x)\\1"])
+    assert stop_words.matches("xx")
+    assert stop_words.matches("aa")
+    assert not stop_words.matches("ax")
+
+
+def test_empty_rules_match_nothing():
+    stop_words = StopWords(["", "  "])
+    assert not stop_words.matches("anything")
+    assert stop_words.excluded_indexes([("anything", "ООО")]) == set()
+
+
+@pytest.mark.parametrize("rules, items", [
+    (["re:python\\s+ооо"], [("Python", "ООО Ромашка")]),
+    (["re:ромашка\\W+java"], [("Dev", "ООО Ромашка"), ("Java dev", "ООО Лютик")]),
+    (["re:ка$"], [("Python", "ООО Ромашка"), ("Straße", "ООО")]),
+    (["re:^junior\\b", "re:ss$", "word:java", "sql"], [("Junior Python", "Straße"), ("Senior", "ООО Java"), (None, "MySQL"), ("", "")]),
+    (["re:(?i)lead", "re:(?P<w>dev)ops", "re:(?P<w>qa)"], [("Team Lead", "X"), ("DevOps", "Y"), ("Python", "QA Labs"), ("Python", "Z")]),
+])
+def test_excluded_indexes_agrees_with_matches(rules, items):
+    # пакетная проверка страницы не должна расходиться с проверкой по карточке
+    stop_words = StopWords(rules)
+    expected = {i for i, (title, employer) in enumerate(items) if stop_words.matches(title, employer)}
+    assert stop_words.excluded_indexes(items) == expected
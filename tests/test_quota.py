@@ -0,0 +1,45 @@
+import time
+import pytest
+from quota import ResponseQuota, LIMIT_BACKOFF
+
+
+def test_window_expires_old_responses():
+    now = time.time()
+    quota = ResponseQuota(limit=3, window=100)
+    quota.sync([now - 150, now - 90, now - 50, now - 10])
+    assert len(quota.sent) == 3
+    assert quota.remaining() == 0
+    # освободится отклик, отправленный 90 секунд назад
+    assert quota.next_free_at() == pytest.approx(now + 10, abs=1)
+
+
+def test_free_slot_is_available_now():
+    quota = ResponseQuota(limit=3, window=100)
+    quota.sync([time.time() - 10])
+    assert quota.remaining() == 2
+    assert quota.next_free_at() == pytest.approx(time.time(), abs=1)
+
+
+def test_cycle_budget_is_an_even_share():
+    quota = ResponseQuota(limit=200, window=24 * 60 * 60)
+    quota.sync([])
+    assert quota.cycle_budget(30 * 60) == 5
+    quota.sync([time.time()] * 198)
+    assert quota.cycle_budget(30 * 60) == 2
+
+
+def test_exhausted_blocks_until_oldest_response_expires():
+    now = time.time()
+    quota = ResponseQuota(limit=3, window=100)
+    quota.sync([now - 40])
+    quota.exhausted()
+    assert quota.remaining() == 0
+    assert quota.next_free_at() == pytest.approx(now + 60, abs=1)
+
+
+def test_exhausted_without_known_responses_backs_off():
+    quota = ResponseQuota(limit=3, window=100)
+    quota.sync([])
+    quota.exhausted()
+    assert quota.cycle_budget(10) == 0
+    assert quota.next_free_at() == pytest.approx(time.time() + LIMIT_BACKOFF, abs=1)
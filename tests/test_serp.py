@@ -0,0 +1,70 @@
+import pytest
+import requests
+from http_client import fetch_html
+from serp import city, normalize_card, parse_serp, parse_total, vacancy_id
+
+
+@pytest.mark.parametrize("page", [0, 1])
+def test_parse_serp_reads_stand_pages(stand, page):
+    page_html, page_url = fetch_html(requests.Session(), f"{stand.url}/search/vacancy?text=python&page={page}")
+    cards, total = parse_serp(page_html, page_url)
+
+    assert total == stand.total
+    expected = stand.page_vacancies(page)
+    assert [card["id"] for card in cards] == [vacancy["id"] for vacancy in expected]
+    for card, vacancy in zip(cards, expected):
+        assert card["title"] == vacancy["title"]
+        assert card["employer"] == vacancy["employer"]
+        assert card["city"] == city(vacancy["city"])
+        assert card["viewed"] == vacancy["viewed"]
+        assert card["link"].startswith(f"{stand.url}/vacancy/{vacancy['id']}?")
+
+
+def test_parse_serp_follows_inner_text():
+    # те же значения, что вернул бы SERP_CARDS_JS через innerText и normalize_card
+    page_html = """
+    <h1 data-qa="vacancies-search-header">Найдено 1 234 вакансии</h1>
+    <div data-qa="vacancy-serp__vacancy">
+      <a data-qa="serp-item__title" href="/vacancy/42?from=serp">
+        <span data-qa="serp-item__title-text">Python <mark>Dev</mark><br>Lead<script>track()</script></span>
+      </a>
+      <span data-qa="vacancy-serp__vacancy-employer-text">ООО<!-- x --> «Ромашка»</span>
+      <span data-qa="vacancy-serp__vacancy-address"><div>Москва</div><div>, Арбатская</div></span>
+    </div>
+    """
+    cards, total = parse_serp(page_html, "https://hh.ru/search/vacancy?text=python")
+    assert total == 1234
+    assert cards == [normalize_card({
+        "title": "Python Dev\nLead",
+        "employer": "ООО «Ромашка»",
+        "address": "Москва\n, Арбатская",
+        "link": "https://hh.ru/vacancy/42?from=serp",
+        "viewed": False,
+    })]
+    assert cards[0]["title"] == "Python Dev Lead"
+    assert cards[0]["city"] == "Москва"
+
+
+def test_parse_serp_empty_page():
+    assert parse_serp("   ", "https://hh.ru") == ([], None)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Найдено 1 234 вакансии", 1234),
+    ("Найдено 12 345 вакансий", 12345),
+    ("Найдено 7 вакансий", 7),
+    ("Ничего не найдено", None),
+    (None, None),
+])
+def test_parse_total(text, expected):
+    assert parse_total(text) == expected
+
+
+@pytest.mark.parametrize("link, expected", [
+    ("https://hh.ru/vacancy/123?query=python", "123"),
+    ("https://hh.ru/applicant/vacancy_response?vacancyId=456", "456"),
+    ("https://example.com/jobs/1", None),
+    (None, None),
+])
+def test_vacancy_id(link, expected):
+    assert vacancy_id(link) == expected
@@ -0,0 +1,60 @@
+# Условия готовности страницы вместо фиксированных time.sleep.
+# NETWORK_IDLE_JS ставится в каждую страницу через CDP и считает незавершённые
+# fetch/XHR запросы и время последней мутации DOM
+NETWORK_IDLE_JS = """
+(() => {
+    if (window.__hhNetwork) return;
+    const state = window.__hhNetwork = {inflight: 0, last: performance.now()};
+    const touch = () => { state.last = performance.now(); };
+    const done = () => { state.inflight--; touch(); };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function (...args) {
+            state.inflight++;
+            touch();
+            return fetch.apply(this, args).finally(done);
+        };
+    }
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        state.inflight++;
+        touch();
+        this.addEventListener("loadend", done, {once: true});
+        return send.apply(this, args);
+    };
+    new MutationObserver(touch).observe(document, {childList: true, subtree: true, attributes: true});
+})();
+"""
+
+NETWORK_IDLE_CHECK_JS = """
+if (document.readyState !== "complete") return false;
+const state = window.__hhNetwork;
+if (!state) return true;
+return state.inflight <= 0 && performance.now() - state.last >= arguments[0];
+"""
+
+# клик, после которого network_idle отсчитывает тишину с момента нажатия: иначе
+# «затишье» до клика засчитывается сразу, и переход через location.assign
+# или попап с задержкой не успевают начаться
+CLICK_AND_MARK_JS = """
+const state = window.__hhNetwork || (window.__hhNetwork = {inflight: 0, last: 0});
+state.last = performance.now();
+arguments[0].scrollIntoView({block: "center"});
+arguments[0].click();
+"""
+
+
+class network_idle:
+    def __init__(self, quiet: float = 0.5):
+        self.quiet = quiet
+
+    def __call__(self, driver):
+        return driver.execute_script(NETWORK_IDLE_CHECK_JS, self.quiet * 1000)
+
+
+def install_network_idle(driver):
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_IDLE_JS})
+        return True
+    except Exception:
+        return False